@@ -0,0 +1,14 @@
+from fastapi import Depends, Request
+from app.api.endpoints.auth import oauth2_scheme
+
+
+async def get_current_user_payload(token: str = Depends(oauth2_scheme)):
+    """Dependency to get the full token payload (sub and role)"""
+    from app.core.security import verify_token
+    return verify_token(token)
+
+
+def get_primary_db(request: Request):
+    """Primary session dependency; the database layer is imported on first use to keep startup fast"""
+    from app.db.database import get_db
+    yield from get_db(request)
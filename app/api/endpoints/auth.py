@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from app.core.config import settings
+from app.core.revocation import revoke_token, revoke_user_tokens
 from app.core.security import verify_password, create_access_token, verify_token
 from app.utils.responses import APIResponse
 from app.schemas.auth import Token, UserLogin
@@ -18,7 +21,8 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     demo_user = {
         "username": "admin",
         "password": "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW",  # "secret"
-        "email": "admin@example.com"
+        "email": "admin@example.com",
+        "role": "admin"
     }
     
     if form_data.username != demo_user["username"]:
@@ -33,7 +37,9 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
             status_code=status.HTTP_401_UNAUTHORIZED
         )
     
-    access_token = create_access_token(data={"sub": demo_user["username"]})
+    access_token = create_access_token(
+        data={"sub": demo_user["username"], "role": demo_user["role"]}
+    )
     
     return APIResponse.success(
         data={
@@ -81,4 +87,41 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     return APIResponse.success(
         data=user_data,
         message="User retrieved successfully"
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/logout")
+async def logout(token: str = Depends(oauth2_scheme)):
+    """
+    Logout endpoint - similar to Express.js POST /auth/logout
+    Revokes the presented token in every worker until it expires
+    """
+    payload = verify_token(token)
+    if payload is None:
+        return APIResponse.unauthorized("Invalid token")
+    if "jti" not in payload:
+        return APIResponse.error(message="Token has no id; use /auth/revoke-all to revoke it")
+
+    revoke_token(payload)
+    return APIResponse.success(message="Logged out successfully")
+
+
+@router.post("/revoke-all")
+async def revoke_all(
+    username: Optional[str] = Query(None, description="User whose tokens to revoke (admin only), defaults to yourself"),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Revoke every token issued to a user so far (e.g. after a compromise)
+    Users can revoke their own sessions; admins can revoke anyone's
+    """
+    payload = verify_token(token)
+    if payload is None:
+        return APIResponse.unauthorized("Invalid token")
+
+    target = username or payload.get("sub")
+    if target != payload.get("sub") and payload.get("role") != "admin":
+        return APIResponse.forbidden("Admin role required")
+
+    revoke_user_tokens(target, max_token_lifetime=settings.access_token_expire_minutes * 60)
+    return APIResponse.success(data={"username": target}, message="All tokens revoked")
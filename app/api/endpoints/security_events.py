@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, status
 from datetime import datetime
 from typing import Optional, List
+from app.api.deps import get_current_user_payload, get_primary_db
 from app.api.endpoints.auth import oauth2_scheme
+from app.core.config import settings
+from app.core.profiling import run_in_threadpool
+from app.schemas.security_event import SecurityEventBatch, SecurityEventCreate
 from app.utils.responses import APIResponse
 
 router = APIRouter()
@@ -90,6 +94,70 @@ async def get_security_events(
     )
 
 
+@router.post("/events")
+async def ingest_security_event(
+    event: SecurityEventCreate,
+    current_user: str = Depends(get_current_user_dependency),
+    db=Depends(get_primary_db)
+):
+    """
+    Ingest a single security event from a sensor
+    source_ip is enriched with country and ASN from the local GeoIP database.
+    Retrying with the same idempotency_key is safe: the event is stored once.
+    """
+    if current_user is None:
+        return APIResponse.unauthorized()
+    from app.services.security_event_service import SecurityEventService
+
+    result = await run_in_threadpool(SecurityEventService.ingest_events, db, [event.model_dump()])
+    if result.duplicates:
+        return APIResponse.success(data=result._asdict(), message="Security event already recorded")
+    return APIResponse.created(data=result._asdict(), message="Security event recorded")
+
+
+@router.post("/events/batch")
+async def ingest_security_events(
+    batch: SecurityEventBatch,
+    current_user: str = Depends(get_current_user_dependency),
+    db=Depends(get_primary_db)
+):
+    """
+    Ingest up to 1000 security events in one request and one database round trip
+    Events whose idempotency_key was already stored are skipped and counted as duplicates.
+    """
+    if current_user is None:
+        return APIResponse.unauthorized()
+    from app.services.security_event_service import SecurityEventService
+
+    events = [event.model_dump() for event in batch.events]
+    result = await run_in_threadpool(SecurityEventService.ingest_events, db, events)
+    return APIResponse.created(data=result._asdict(), message="Security events recorded")
+
+
+@router.post("/geoip/reload")
+async def reload_geoip_database(payload: Optional[dict] = Depends(get_current_user_payload)):
+    """
+    Swap in the GeoIP database file at GEOIP_DATABASE_PATH (admin only)
+    Lookups keep using the previous file until the new one is mapped.
+    """
+    if payload is None:
+        return APIResponse.unauthorized()
+    if payload.get("role") != "admin":
+        return APIResponse.forbidden("Admin role required")
+    if not settings.geoip_database_path:
+        return APIResponse.error(message="GEOIP_DATABASE_PATH is not configured")
+    from app.services.geoip_service import geoip
+
+    try:
+        database = await run_in_threadpool(geoip.load, settings.geoip_database_path)
+    except (OSError, ValueError) as exc:
+        return APIResponse.error(
+            message=f"GeoIP database not loaded: {exc}",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return APIResponse.success(data={"ranges": len(database)}, message="GeoIP database reloaded")
+
+
 @router.get("/events/{event_id}")
 async def get_security_event(
     event_id: int,
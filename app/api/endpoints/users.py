@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+import json
+from fastapi import APIRouter, Depends, Query, Request, status
 from typing import List, Optional
+from app.api.deps import get_current_user_payload, get_primary_db
 from app.api.endpoints.auth import oauth2_scheme
+from app.core.config import settings
+from app.core.profiling import run_in_threadpool
 from app.utils.responses import APIResponse
 from app.schemas.user import UserResponse, UserCreate
 
@@ -16,6 +20,98 @@ async def get_current_user_dependency(token: str = Depends(oauth2_scheme)):
     return payload.get("sub")
 
 
+async def _read_import_rows(request: Request) -> List[dict]:
+    """Read import rows from a CSV body, a JSON body or a multipart file upload"""
+    from app.services.user_import_service import UserImportService
+
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise ValueError("Upload the import as a 'file' form field")
+        body = (await upload.read()).decode("utf-8-sig")
+        is_csv = (upload.filename or "").lower().endswith(".csv")
+    else:
+        body = (await request.body()).decode("utf-8-sig")
+        is_csv = content_type.startswith("text/csv")
+
+    if is_csv:
+        return UserImportService.parse_csv(body)
+    try:
+        return UserImportService.parse_json(json.loads(body))
+    except json.JSONDecodeError:
+        raise ValueError("Body must be CSV (text/csv) or JSON")
+
+
+@router.post("/import")
+async def import_users(
+    request: Request,
+    background: bool = Query(True, description="Run as a resumable background job"),
+    payload: Optional[dict] = Depends(get_current_user_payload),
+    db=Depends(get_primary_db)
+):
+    """
+    Bulk import users from CSV or JSON
+    Protected route (admin only). Returns a job to poll when background=true,
+    otherwise per-row results once the import finishes.
+    """
+    if payload is None:
+        return APIResponse.unauthorized()
+    if payload.get("role") != "admin":
+        return APIResponse.forbidden("Admin role required")
+    from app.services.user_import_service import UserImportService, summarize, user_import_runner
+
+    try:
+        rows = await _read_import_rows(request)
+    except (ValueError, UnicodeDecodeError) as exc:
+        return APIResponse.error(message=str(exc), status_code=status.HTTP_400_BAD_REQUEST)
+    if not rows:
+        return APIResponse.error(message="No users to import")
+    if len(rows) > settings.user_import_max_rows:
+        return APIResponse.error(
+            message=f"Import is limited to {settings.user_import_max_rows} rows",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+
+    if background:
+        job = await run_in_threadpool(user_import_runner.submit, rows)
+        return APIResponse.success(
+            data={key: job[key] for key in ("id", "status", "total", "processed")},
+            message="User import job queued",
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
+    results = await run_in_threadpool(UserImportService.import_users, db, rows)
+    return APIResponse.success(
+        data={"summary": summarize(results), "results": results},
+        message="User import completed"
+    )
+
+
+@router.get("/import/{job_id}")
+async def get_import_job(
+    job_id: str,
+    skip: int = Query(0, ge=0, description="Number of row results to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of row results to return"),
+    payload: Optional[dict] = Depends(get_current_user_payload)
+):
+    """Get bulk import job progress and per-row results (admin only)"""
+    if payload is None:
+        return APIResponse.unauthorized()
+    if payload.get("role") != "admin":
+        return APIResponse.forbidden("Admin role required")
+    from app.services.user_import_service import user_import_runner
+
+    job = await run_in_threadpool(user_import_runner.get, job_id)
+    if job is None:
+        return APIResponse.not_found("Import job not found")
+
+    job["results"] = job["results"][skip:skip + limit]
+    job.update({"skip": skip, "limit": limit})
+    return APIResponse.success(data=job, message="Import job retrieved successfully")
+
+
 @router.get("/")
 async def get_users(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
@@ -75,19 +171,30 @@ async def get_user(
 
 @router.post("/")
 async def create_user(
-    current_user: str = Depends(get_current_user_dependency)
+    user_data: UserCreate,
+    payload: Optional[dict] = Depends(get_current_user_payload),
+    db=Depends(get_primary_db)
 ):
     """
     Create new user - similar to Express.js POST /users
-    Protected route (admin only)
+    Protected route (admin only), shares validation with the bulk import
     """
-    if current_user is None:
+    if payload is None:
         return APIResponse.unauthorized()
-    
-    return APIResponse.error(
-        message="User creation not implemented yet",
-        status_code=501
-    )
+    if payload.get("role") != "admin":
+        return APIResponse.forbidden("Admin role required")
+    from app.services.user_import_service import UserImportService
+
+    result, = await run_in_threadpool(UserImportService.import_users, db, [user_data.model_dump()])
+    if result["status"] == "duplicate":
+        return APIResponse.error(message=result["error"], status_code=status.HTTP_409_CONFLICT)
+    if result["status"] == "invalid":
+        return APIResponse.error(
+            message="Validation error",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            details=result["error"]
+        )
+    return APIResponse.created(data={"username": result["username"]}, message="User created")
 
 
 @router.put("/{user_id}")
@@ -0,0 +1,188 @@
+import asyncio
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from app.core.config import Settings, settings as default_settings
+
+PRIORITIES = ("high", "normal", "low")
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed; retry_after is a hint in whole seconds"""
+
+    def __init__(self, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ("rank", "seq", "route", "priority", "future")
+
+    def __init__(self, rank: int, seq: int, route: Optional[str], priority: str, future: asyncio.Future):
+        self.rank = rank
+        self.seq = seq
+        self.route = route
+        self.priority = priority
+        self.future = future
+
+
+class AdmissionController:
+    """
+    Adaptive admission control - similar to toobusy-js / Netflix concurrency-limits
+    Caps the requests a worker runs at once. The cap adapts to observed
+    latency (gradient algorithm): while latency stays within
+    latency_tolerance x the long-term baseline the limit grows, and when
+    latency climbs the limit shrinks so queueing moves out of the DB and
+    into a short, prioritised admission queue.
+
+    Each priority class may use a share of the limit (low priority traffic
+    is shed first) and waits at most its queue timeout. Requests that
+    cannot be admitted in time fail fast with Overloaded instead of
+    timing out later. Routes can also have fixed concurrency caps.
+    Runs on the event loop only, so no locking is needed.
+    """
+
+    def __init__(self, app_settings: Settings = None):
+        app_settings = app_settings or default_settings
+        self.min_limit = app_settings.admission_min_limit
+        self.max_limit = app_settings.admission_max_limit
+        self.limit = float(app_settings.admission_initial_limit)
+        self.latency_tolerance = app_settings.admission_latency_tolerance
+        self.shares = app_settings.admission_priority_shares
+        self.queue_timeouts = app_settings.admission_queue_timeouts
+        self.route_limits = app_settings.admission_route_limits
+        self.exempt_paths = set(app_settings.admission_exempt_paths)
+        self._priority_prefixes = sorted(
+            app_settings.admission_priority_routes.items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self._route_prefixes = sorted(self.route_limits, key=len, reverse=True)
+
+        self.inflight = 0
+        self.rejected = 0
+        self._route_inflight: Dict[str, int] = {}
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+
+        # Latency tracking for the gradient limit
+        self._window_size = 10
+        self._window_total = 0.0
+        self._window_count = 0
+        self.short_latency: Optional[float] = None  # Average of the last window
+        self.long_latency: Optional[float] = None  # Slow moving baseline
+
+    def classify(self, path: str) -> Tuple[str, Optional[str]]:
+        """Return (priority, route-limit prefix) for a request path (longest prefix wins)"""
+        priority = "normal"
+        for prefix, value in self._priority_prefixes:
+            if path.startswith(prefix):
+                priority = value
+                break
+        route = next((prefix for prefix in self._route_prefixes if path.startswith(prefix)), None)
+        return priority, route
+
+    @asynccontextmanager
+    async def admit(self, path: str) -> AsyncIterator[None]:
+        """Hold an admission slot for the duration of the request, or raise Overloaded"""
+        priority, route = self.classify(path)
+        await self._acquire(priority, route)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(route, time.perf_counter() - start)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _can_run(self, priority: str, route: Optional[str]) -> bool:
+        if self.inflight >= max(1, math.floor(self.limit * self.shares.get(priority, 1.0))):
+            return False
+        return route is None or self._route_inflight.get(route, 0) < self.route_limits[route]
+
+    def _start(self, route: Optional[str]) -> None:
+        self.inflight += 1
+        if route is not None:
+            self._route_inflight[route] = self._route_inflight.get(route, 0) + 1
+
+    def _retry_after(self) -> int:
+        drain = (self.queued + 1) * (self.short_latency or 1.0) / max(self.limit, 1.0)
+        return max(1, math.ceil(drain))
+
+    def _reject(self, reason: str) -> Overloaded:
+        self.rejected += 1
+        return Overloaded(self._retry_after(), reason)
+
+    async def _acquire(self, priority: str, route: Optional[str]) -> None:
+        rank = PRIORITIES.index(priority) if priority in PRIORITIES else len(PRIORITIES)
+        ahead = sum(1 for waiter in self._waiters if waiter.rank <= rank)
+        if ahead == 0 and self._can_run(priority, route):
+            self._start(route)
+            return
+
+        # Queue timeouts cover waiting plus the expected service time; shed now if the
+        # queue ahead would not drain in time for this request to finish
+        max_wait = self.queue_timeouts.get(priority, 1.0) - (self.short_latency or 0.0)
+        expected_wait = (ahead + 1) * (self.short_latency or 0.0) / max(self.limit, 1.0)
+        if expected_wait > max_wait or len(self._waiters) >= self.max_limit:
+            raise self._reject("queue too long")
+
+        waiter = _Waiter(rank, next(self._seq), route, priority, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self._waiters.sort(key=lambda item: (item.rank, item.seq))
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), max_wait)
+        except asyncio.TimeoutError:
+            if waiter.future.done():  # Granted just as the deadline passed
+                return
+            self._waiters.remove(waiter)
+            raise self._reject("queue deadline exceeded")
+        except asyncio.CancelledError:
+            if waiter.future.done():
+                self._release(route, None)  # Client went away after being granted
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release(self, route: Optional[str], latency: Optional[float]) -> None:
+        self.inflight -= 1
+        if route is not None:
+            self._route_inflight[route] -= 1
+        if latency is not None:
+            self._observe(latency)
+        self._grant_waiters()
+
+    def _grant_waiters(self) -> None:
+        for waiter in list(self._waiters):
+            if self._can_run(waiter.priority, waiter.route):
+                self._waiters.remove(waiter)
+                self._start(waiter.route)
+                waiter.future.set_result(None)
+
+    def _observe(self, latency: float) -> None:
+        self._window_total += latency
+        self._window_count += 1
+        if self._window_count < self._window_size:
+            return
+        short = self._window_total / self._window_count
+        self._window_total, self._window_count = 0.0, 0
+        self.short_latency = short
+
+        if self.long_latency is None:
+            self.long_latency = short
+        elif short <= self.latency_tolerance * self.long_latency or self.limit <= self.min_limit:
+            # Hold the baseline while overloaded so it cannot drift up to the congested
+            # latency; at the minimum limit there is no queueing left, so the DB really is slower
+            self.long_latency += (short - self.long_latency) / 100  # ~100 windows of memory
+            if self.long_latency > 2 * short:
+                self.long_latency *= 0.95  # Recover quickly after latency drops
+
+        gradient = max(0.5, min(1.0, self.latency_tolerance * self.long_latency / short))
+        if gradient == 1.0 and self.inflight < self.limit / 2:
+            return  # Not using the limit, so latency says nothing about raising it
+        new_limit = self.limit * gradient + math.sqrt(self.limit)  # sqrt(limit) of queueing headroom
+        self.limit = min(self.max_limit, max(self.min_limit, self.limit * 0.8 + new_limit * 0.2))
+        self._grant_waiters()
@@ -0,0 +1,123 @@
+import hmac
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from app.core.config import settings
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram - similar to prom-client Histogram in Node.js
+    Bucket counts are stored non-cumulatively and summed at render time,
+    so an observation is a single bisect plus two increments
+    """
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation (in seconds)"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        """Return cumulative bucket counts, including the +Inf bucket"""
+        running = 0
+        result = []
+        for bucket_count in self.counts:
+            running += bucket_count
+            result.append(running)
+        return result
+
+
+class MetricsRegistry:
+    """
+    Per-worker metrics registry
+    All updates happen on the event loop thread, so plain integer
+    increments are safe without locks. Each worker process keeps its own
+    registry; aggregate across workers in Prometheus with sum().
+    """
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        self.buckets = tuple(sorted(buckets or settings.metrics_latency_buckets))
+        self.requests: Dict[Tuple[str, str, int], LatencyHistogram] = {}
+        self.gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+
+    def observe_request(self, method: str, route: str, status_code: int, duration: float) -> None:
+        """Record latency for a request keyed by method, route template and status"""
+        key = (method, route, status_code)
+        histogram = self.requests.get(key)
+        if histogram is None:
+            histogram = self.requests[key] = LatencyHistogram(self.buckets)
+        histogram.observe(duration)
+
+    def register_gauge(self, name: str, help_text: str, callback: Callable[[], float]) -> None:
+        """Register a gauge whose value is read from callback at scrape time"""
+        self.gauges[name] = (help_text, callback)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP http_requests_total Total HTTP requests by method, route and status",
+            "# TYPE http_requests_total counter",
+        ]
+        items = sorted(self.requests.items())
+        for (method, route, status_code), histogram in items:
+            labels = _format_labels(method, route, status_code)
+            lines.append(f"http_requests_total{{{labels}}} {histogram.count}")
+
+        lines.append("# HELP http_request_duration_seconds HTTP request latency")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (method, route, status_code), histogram in items:
+            labels = _format_labels(method, route, status_code)
+            cumulative = histogram.cumulative()
+            for bound, bucket_count in zip(self.buckets, cumulative):
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {bucket_count}'
+                )
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative[-1]}'
+            )
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram.total}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {histogram.count}")
+
+        for name, (help_text, callback) in sorted(self.gauges.items()):
+            try:
+                value = float(callback())
+            except Exception:
+                continue  # A broken gauge must not take down the whole scrape
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def is_scrape_allowed(client_host: Optional[str], authorization: Optional[str]) -> bool:
+    """
+    Check whether a client may read /metrics
+    Allowed when the direct peer address is in metrics_allowed_ips, or when
+    the request carries metrics_token as a bearer token. Forwarded-for
+    headers are ignored since any client can set them.
+    """
+    if client_host is not None and client_host in settings.metrics_allowed_ips:
+        return True
+    if settings.metrics_token and authorization:
+        scheme, _, token = authorization.partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(token, settings.metrics_token)
+    return False
+
+
+def _format_labels(method: str, route: str, status_code: int) -> str:
+    """Format request labels, escaping values per the exposition format"""
+    route = route.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'method="{method}",route="{route}",status="{status_code}"'
+
+
+# Global metrics registry instance
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional
+from starlette.concurrency import run_in_threadpool as _run_in_threadpool
+from app.core.config import settings
+
+
+class RequestSampler:
+    """
+    Sampling profiler scoped to a single request
+    A background thread periodically snapshots the event loop thread's
+    stack and keeps only samples whose frame chain passes through the
+    request's marker frame, so concurrent requests on the same loop are
+    not attributed to the profiled one. While the request's task is
+    suspended, the sampler records its await chain instead: the stacks of
+    threadpool threads working for the request (see run_in_threadpool),
+    or an off-CPU sample ending in "[off-cpu]" when it is waiting on I/O.
+    """
+
+    def __init__(self, marker: FrameType, task: Optional[asyncio.Task] = None, interval: float = None,
+                 max_depth: int = 128):
+        self.marker = marker
+        self.task = task
+        self.interval = interval or settings.profiling_interval_ms / 1000
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self._thread_id = threading.get_ident()
+        self._worker_markers: Dict[int, FrameType] = {}  # Threadpool thread id -> frame that started the work
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Signal the sampler thread to exit; does not block"""
+        self._stop.set()
+
+    def join(self) -> None:
+        """Wait for the sampler thread; call off the event loop"""
+        self._thread.join()
+
+    def call_in_worker(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run func on the current (threadpool) thread with that thread included in samples"""
+        thread_id = threading.get_ident()
+        self._worker_markers[thread_id] = sys._getframe()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._worker_markers.pop(thread_id, None)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            for stack in self._sample(sys._current_frames()):
+                self.samples[";".join(stack)] += 1
+
+    def _sample(self, frames: Dict[int, FrameType]) -> List[List[str]]:
+        """Root-first stacks for one tick: on the loop, in worker threads, or off-CPU"""
+        on_loop = self._stack_below_marker(frames.get(self._thread_id), self.marker)
+        if on_loop:
+            return [on_loop[::-1]]
+        awaiting = self._awaiting_stack()
+        if awaiting is None:
+            return []
+        workers = [
+            self._stack_below_marker(frames.get(thread_id), marker)
+            for thread_id, marker in list(self._worker_markers.items())
+        ]
+        workers = [awaiting + stack[::-1] for stack in workers if stack]
+        return workers or [awaiting + ["[off-cpu]"]]
+
+    def _stack_below_marker(self, frame: Optional[FrameType], marker: FrameType) -> List[str]:
+        """Return leaf-first frame names, or [] if the marker is not on the stack"""
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            if frame is marker:
+                return stack
+            stack.append(_frame_name(frame))
+            frame = frame.f_back
+        return []
+
+    def _awaiting_stack(self) -> Optional[List[str]]:
+        """Root-first frames the suspended task is awaiting below the marker, None if not found"""
+        if self.task is None or self.task.done():
+            return None
+        stack, below_marker = [], False
+        awaitable = self.task.get_coro()
+        while awaitable is not None and len(stack) < self.max_depth:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                break
+            if below_marker:
+                stack.append(_frame_name(frame))
+            below_marker = below_marker or frame is self.marker
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+        return stack if below_marker else None
+
+    def collapsed(self) -> str:
+        """Render samples in flamegraph.pl / speedscope collapsed stack format"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+# Sampler profiling the current request, if any; read by run_in_threadpool
+current_sampler: ContextVar[Optional[RequestSampler]] = ContextVar("current_sampler", default=None)
+
+
+async def run_in_threadpool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    starlette.concurrency.run_in_threadpool that keeps profiling the request
+    When the calling request is being profiled, the worker thread is sampled
+    for as long as func runs. Use it for blocking work in endpoints.
+    """
+    sampler = current_sampler.get()
+    if sampler is not None:
+        return await _run_in_threadpool(sampler.call_in_worker, func, *args, **kwargs)
+    return await _run_in_threadpool(func, *args, **kwargs)
+
+
+def sign_profile_request(path: str, ttl_seconds: int = 300) -> str:
+    """Create a value for the X-Profile-Signature header that is valid for ttl_seconds"""
+    expires = int(time.time()) + ttl_seconds
+    return f"{expires}.{_signature(expires, path)}"
+
+
+def verify_profile_signature(value: str, path: str) -> bool:
+    """Check an X-Profile-Signature header value against the request path"""
+    expires, _, signature = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(int(expires), path))
+
+
+def _signature(expires: int, path: str) -> str:
+    key = (settings.profiling_secret or settings.secret_key).encode()
+    return hmac.new(key, f"{expires}:{path}".encode(), hashlib.sha256).hexdigest()
+
+
+def finish_profile(sampler: RequestSampler, profile_id: str) -> str:
+    """Wait for the sampler to stop and store its output (blocking, run in a thread)"""
+    sampler.join()
+    return store_profile(profile_id, sampler.collapsed())
+
+
+def store_profile(profile_id: str, collapsed: str) -> str:
+    """Write a collapsed stack file and prune old profiles to the storage bounds"""
+    directory = settings.profiling_dir
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{profile_id}.collapsed")
+    with open(path, "w") as profile_file:
+        profile_file.write(collapsed)
+    _prune_profiles(directory)
+    return path
+
+
+def _prune_profiles(directory: str) -> None:
+    """Delete the oldest profiles until count and size limits are satisfied"""
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(".collapsed"):
+            stat = os.stat(os.path.join(directory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+    entries.sort()
+
+    total_bytes = sum(size for _, size, _ in entries)
+    while entries and (
+        len(entries) > settings.profiling_max_files
+        or total_bytes > settings.profiling_max_bytes
+    ):
+        _, size, name = entries.pop(0)
+        total_bytes -= size
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    In-memory token revocation list - similar to a JWT denylist in Express.js
+    Holds revoked token ids (jti) until the token's exp, and per-user
+    cutoffs that revoke every token the user was issued up to that moment.
+    Entries sit in a time wheel keyed by expiry (one slot per `resolution`
+    seconds), so memory is bounded by the tokens that are still live.
+
+    is_revoked() is two dict lookups with no lock and no I/O; expired
+    entries are dropped on writes and by expire().
+    """
+
+    def __init__(self, resolution: float = 1.0):
+        self.resolution = resolution
+        self._tokens: Dict[str, float] = {}  # jti -> exp
+        self._users: Dict[str, Tuple[float, float]] = {}  # sub -> (cutoff, until)
+        self._wheel: Dict[int, List[Tuple[str, str]]] = {}
+        self._cursor = self._slot(time.time())
+        self._lock = threading.Lock()
+
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        """Check a decoded token; tokens without iat count as issued before any cutoff"""
+        jti = payload.get("jti")
+        if jti is not None and jti in self._tokens:
+            return True
+        user = self._users.get(payload.get("sub"))
+        return user is not None and payload.get("iat", 0) <= user[0]
+
+    def revoke_token(self, jti: str, exp: float) -> bool:
+        """Revoke a single token until its exp; returns False if it had already expired"""
+        with self._lock:
+            self._expire(time.time())
+            if exp <= time.time():
+                return False
+            self._tokens[jti] = exp
+            self._schedule(exp, ("token", jti))
+            return True
+
+    def revoke_user(self, sub: str, cutoff: float, until: float) -> None:
+        """Revoke every token for sub issued at or before cutoff; forgotten after until"""
+        with self._lock:
+            self._expire(time.time())
+            current = self._users.get(sub)
+            if current is not None:
+                cutoff, until = max(cutoff, current[0]), max(until, current[1])
+            self._users[sub] = (cutoff, until)
+            self._schedule(until, ("user", sub))
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        """Apply a revocation event published by another worker"""
+        if event.get("type") == "token":
+            self.revoke_token(event["jti"], event["exp"])
+        elif event.get("type") == "user":
+            self.revoke_user(event["sub"], event["cutoff"], event["until"])
+
+    def expire(self, now: float = None) -> None:
+        with self._lock:
+            self._expire(time.time() if now is None else now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+            self._wheel.clear()
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def _slot(self, timestamp: float) -> int:
+        return int(timestamp // self.resolution)
+
+    def _schedule(self, expires_at: float, entry: Tuple[str, str]) -> None:
+        self._wheel.setdefault(self._slot(expires_at), []).append(entry)
+
+    def _expire(self, now: float) -> None:
+        # Slots strictly before the current one only hold entries that have expired
+        now_slot = self._slot(now)
+        if now_slot - self._cursor > len(self._wheel):
+            slots = sorted(slot for slot in self._wheel if slot < now_slot)  # Long idle gap
+        else:
+            slots = range(self._cursor, now_slot)
+        for slot in slots:
+            for kind, key in self._wheel.pop(slot, ()):
+                if kind == "token":
+                    self._tokens.pop(key, None)
+                elif key in self._users and self._slot(self._users[key][1]) == slot:
+                    del self._users[key]  # Otherwise a later revoke_user() moved it to a later slot
+        self._cursor = max(self._cursor, now_slot)
+
+
+class RedisRevocationSync:
+    """
+    Share revocations between worker processes through Redis
+    Each revocation is added to a sorted set (scored by expiry) and published
+    on a channel. Workers subscribe first, then load the sorted set, so a
+    worker that starts or reconnects catches up on revocations it missed.
+    Publishing happens in the background so requests never wait on Redis;
+    while disconnected, revocations are queued and sent on reconnect.
+    """
+
+    def __init__(self, revocations: RevocationList, redis_url: str, key: str, timeout: float = 2.0):
+        self.revocations = revocations
+        self.redis_url = redis_url
+        self.key = key
+        self.timeout = timeout
+        self._client = None
+        self._pending: List[Dict[str, Any]] = []
+        self._publishing: Set[asyncio.Task] = set()
+        self.connected = False  # Set by run() while subscribed
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis.asyncio as redis  # Imported lazily, only workers that sync need it
+
+            self._client = redis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=self.timeout,
+                health_check_interval=30,
+            )
+        return self._client
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Publish a revocation already applied locally, without waiting (call on the event loop)"""
+        if not self.connected:
+            self._queue(event)  # run() sends it once it reconnects
+            return
+        task = asyncio.get_running_loop().create_task(self._publish_or_queue(event))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def run(self) -> None:
+        """Apply revocations from other workers until cancelled, reconnecting with backoff"""
+        delay = 1.0
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.key)
+                await self._flush_pending()
+                self.connected = True
+                for member in await self.client.zrangebyscore(self.key, time.time(), "+inf"):
+                    self.revocations.apply(json.loads(member))
+                delay = 1.0
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.revocations.apply(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Token revocation sync disconnected, retrying in %.0fs: %s", delay, exc)
+            finally:
+                self.connected = False
+                await pubsub.aclose()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def close(self) -> None:
+        if self._publishing:
+            await asyncio.wait(self._publishing, timeout=self.timeout)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _publish(self, event: Dict[str, Any]) -> None:
+        member = json.dumps(event, sort_keys=True)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.key, {member: _expires_at(event)})
+            pipe.zremrangebyscore(self.key, "-inf", time.time())
+            pipe.publish(self.key, member)
+            await pipe.execute()
+
+    async def _publish_or_queue(self, event: Dict[str, Any]) -> None:
+        try:
+            await asyncio.wait_for(self._publish(event), self.timeout)
+        except Exception as exc:  # Timeouts, connection and Redis errors
+            logger.warning("Token revocation not synced, will retry: %s", exc)
+            self._queue(event)
+
+    def _queue(self, event: Dict[str, Any]) -> None:
+        now = time.time()
+        self._pending = [pending for pending in self._pending if _expires_at(pending) > now]
+        self._pending.append(event)
+
+    async def _flush_pending(self) -> None:
+        while self._pending:
+            if _expires_at(self._pending[0]) > time.time():
+                await self._publish(self._pending[0])
+            self._pending.pop(0)
+
+
+def _expires_at(event: Dict[str, Any]) -> float:
+    return event["exp"] if event["type"] == "token" else event["until"]
+
+
+# Global revocation list, checked by verify_token()
+revocation_list = RevocationList()
+# Set by the app lifespan when revocations are shared through Redis
+revocation_sync: Optional[RedisRevocationSync] = None
+
+
+def revoke_token(payload: Dict[str, Any]) -> bool:
+    """Revoke one decoded token (logout) in this worker and, when syncing, in all workers"""
+    event = {"type": "token", "jti": payload["jti"], "exp": float(payload["exp"])}
+    if not revocation_list.revoke_token(event["jti"], event["exp"]):
+        return False
+    if revocation_sync is not None:
+        revocation_sync.publish(event)
+    return True
+
+
+def revoke_user_tokens(sub: str, max_token_lifetime: float) -> None:
+    """Revoke every token issued to sub so far; kept for the longest token lifetime"""
+    cutoff = time.time()
+    event = {"type": "user", "sub": sub, "cutoff": cutoff, "until": cutoff + max_token_lifetime}
+    revocation_list.revoke_user(sub, event["cutoff"], event["until"])
+    if revocation_sync is not None:
+        revocation_sync.publish(event)
@@ -0,0 +1,244 @@
+import importlib.util
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from multiprocessing.synchronize import Event
+from typing import List, NamedTuple, Optional
+import uvicorn
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+APP_PATH = "app.main:app"
+
+
+def serve() -> None:
+    """
+    Start the server - similar to `node server.js` vs `pm2 start -i max`
+    Development runs a single reloading uvicorn process, production runs
+    the multi-worker supervisor.
+    """
+    if settings.environment == "production":
+        sys.exit(WorkerSupervisor().run())
+    else:
+        uvicorn.run(
+            APP_PATH,
+            host=settings.server_host,
+            port=settings.server_port,
+            reload=settings.debug,
+            log_level="info" if not settings.debug else "debug"
+        )
+
+
+def _event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def _http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def _bind_socket(reuse_port: bool) -> socket.socket:
+    """Bind a listening TCP socket, optionally with SO_REUSEPORT"""
+    family = socket.AF_INET6 if ":" in settings.server_host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((settings.server_host, settings.server_port))
+    sock.set_inheritable(True)
+    return sock
+
+
+class _WorkerServer(uvicorn.Server):
+    """uvicorn server that signals the supervisor once it is accepting connections"""
+
+    def __init__(self, config: uvicorn.Config, ready: Event):
+        super().__init__(config)
+        self.ready = ready
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            self.ready.set()
+
+
+def _run_worker(shared_socket: Optional[socket.socket], ready: Event, max_requests: Optional[int]) -> None:
+    """Worker process entry point"""
+    sock = shared_socket or _bind_socket(reuse_port=True)
+    config = uvicorn.Config(
+        APP_PATH,
+        loop=_event_loop(),
+        http=_http_protocol(),
+        limit_max_requests=max_requests,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        backlog=settings.server_backlog,
+        log_level="info",
+    )
+    _WorkerServer(config, ready).run(sockets=[sock])
+
+
+class _Worker(NamedTuple):
+    """Handle to a worker process, its readiness flag and spawn time"""
+    process: multiprocessing.Process
+    ready: Event
+    started_at: float
+
+
+class WorkerSupervisor:
+    """
+    Multi-worker process supervisor - similar to Node.js cluster / pm2
+    - Runs N uvicorn workers (defaults to the CPU count)
+    - Spreads connections with SO_REUSEPORT when the platform supports it,
+      otherwise workers accept from one shared listening socket
+    - Replaces workers that exit, e.g. after hitting server_max_requests
+    - Backs off when a worker dies during startup and gives up after
+      server_worker_max_failures consecutive failures in the same slot
+    - Performs a rolling restart on SIGHUP: each worker is replaced only
+      after its successor is accepting connections
+    """
+
+    def __init__(self, workers: int = None):
+        self.worker_count = workers or settings.server_workers or os.cpu_count() or 1
+        self.reuse_port = settings.server_reuse_port and hasattr(socket, "SO_REUSEPORT")
+        self.context = multiprocessing.get_context("spawn")
+        self.shared_socket: Optional[socket.socket] = None
+        self.workers: List[Optional[_Worker]] = []
+        self.failures: List[int] = []
+        self.respawn_at: List[float] = []
+        self.should_exit = False
+        self.reload_requested = False
+        self.exit_code = 0
+
+    def run(self) -> int:
+        """Run until SIGINT/SIGTERM; returns the process exit code"""
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+        if not self.reuse_port:
+            self.shared_socket = _bind_socket(reuse_port=False)
+
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._handle_reload)
+
+        logger.info(
+            "Starting %d workers on %s:%d (loop=%s, http=%s, %s)",
+            self.worker_count, settings.server_host, settings.server_port,
+            _event_loop(), _http_protocol(),
+            "SO_REUSEPORT" if self.reuse_port else "shared socket",
+        )
+        self.workers = [self._spawn() for _ in range(self.worker_count)]
+        self.failures = [0] * self.worker_count
+        self.respawn_at = [0.0] * self.worker_count
+
+        while not self.should_exit:
+            if self.reload_requested:
+                self.reload_requested = False
+                self._rolling_restart()
+            self._replace_exited_workers()
+            time.sleep(0.5)
+
+        self._shutdown()
+        return self.exit_code
+
+    def _handle_exit(self, signum, frame) -> None:
+        self.should_exit = True
+
+    def _handle_reload(self, signum, frame) -> None:
+        self.reload_requested = True
+
+    def _max_requests(self) -> Optional[int]:
+        if settings.server_max_requests <= 0:
+            return None
+        # Jitter keeps workers from all recycling at the same moment
+        return settings.server_max_requests + random.randint(0, settings.server_max_requests_jitter)
+
+    def _spawn(self) -> _Worker:
+        ready = self.context.Event()
+        process = self.context.Process(
+            target=_run_worker,
+            args=(self.shared_socket, ready, self._max_requests()),
+        )
+        process.start()
+        logger.info("Started worker [%d]", process.pid)
+        return _Worker(process, ready, time.monotonic())
+
+    def _stop(self, worker: _Worker) -> None:
+        """Ask a worker to finish in-flight requests, then force it if it does not"""
+        if worker.process.is_alive():
+            worker.process.terminate()  # SIGTERM -> uvicorn graceful shutdown
+        worker.process.join(settings.server_graceful_timeout + 5)
+        if worker.process.is_alive():
+            logger.warning("Worker [%d] did not stop in time, killing", worker.process.pid)
+            worker.process.kill()
+            worker.process.join()
+
+    def _replace_exited_workers(self) -> None:
+        now = time.monotonic()
+        for index, worker in enumerate(self.workers):
+            if self.should_exit:
+                return
+
+            if worker is not None:
+                if worker.process.is_alive():
+                    continue
+                worker.process.join()
+                self.workers[index] = None
+                uptime = now - worker.started_at
+                crashed_early = worker.process.exitcode != 0 and uptime < settings.server_worker_min_uptime
+                if worker.ready.is_set() and not crashed_early:
+                    # Normal recycling (max requests) or a crash after a healthy run
+                    logger.info("Worker [%d] exited with code %s, replacing",
+                                worker.process.pid, worker.process.exitcode)
+                    self.failures[index] = 0
+                else:
+                    self.failures[index] += 1
+                    if self.failures[index] >= settings.server_worker_max_failures:
+                        logger.error(
+                            "Worker slot %d failed %d times in a row during startup, giving up",
+                            index, self.failures[index],
+                        )
+                        self.exit_code = 1
+                        self.should_exit = True
+                        return
+                    delay = min(0.5 * 2 ** self.failures[index], 30.0)
+                    logger.warning(
+                        "Worker [%d] exited with code %s after %.1fs, retrying in %.1fs",
+                        worker.process.pid, worker.process.exitcode, uptime, delay,
+                    )
+                    self.respawn_at[index] = now + delay
+
+            if now >= self.respawn_at[index]:
+                self.workers[index] = self._spawn()
+
+    def _rolling_restart(self) -> None:
+        logger.info("Received SIGHUP, performing rolling restart")
+        for index, old_worker in enumerate(list(self.workers)):
+            if self.should_exit:
+                return
+            new_worker = self._spawn()
+            if not new_worker.ready.wait(settings.server_graceful_timeout):
+                logger.error("Worker [%d] failed to start, keeping the current worker",
+                             new_worker.process.pid)
+                self._stop(new_worker)
+                continue
+            self.workers[index] = new_worker
+            self.failures[index] = 0
+            if old_worker is not None:
+                self._stop(old_worker)
+
+    def _shutdown(self) -> None:
+        workers = [worker for worker in self.workers if worker is not None]
+        logger.info("Shutting down %d workers", len(workers))
+        for worker in workers:
+            if worker.process.is_alive():
+                worker.process.terminate()
+        for worker in workers:
+            self._stop(worker)
+        if self.shared_socket is not None:
+            self.shared_socket.close()
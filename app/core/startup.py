@@ -0,0 +1,48 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """
+    Cold start timing - similar to `node --cpu-prof` for boot time
+    Collects how long each import and initialization phase takes so cold
+    start can be kept under settings.startup_budget_ms. Deliberately has no
+    third-party imports so it can be loaded before anything heavy.
+    """
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of code as a named phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    @property
+    def total_ms(self) -> float:
+        return sum(duration for _, duration in self.phases)
+
+    def as_dict(self) -> Dict:
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "phases": {name: round(duration, 2) for name, duration in self.phases},
+        }
+
+    def log(self, budget_ms: float) -> None:
+        """Log the phase breakdown and warn when the budget is exceeded"""
+        breakdown = ", ".join(f"{name}={duration:.1f}ms" for name, duration in self.phases)
+        logger.info("Startup took %.1fms (%s)", self.total_ms, breakdown)
+        if budget_ms and self.total_ms > budget_ms:
+            logger.warning("Startup exceeded budget: %.1fms > %.1fms", self.total_ms, budget_ms)
+
+
+# Global startup report for this process
+startup_report = StartupReport()
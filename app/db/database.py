@@ -1,30 +1,157 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
-
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.debug  # Log SQL queries in debug mode
-)
-
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+import hashlib
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from app.core.config import Settings, settings
+from app.db.replicas import RecentWriters, ReplicaSet, RoutingSession
+
+# Session factories, bound to the primary engine by init_engine()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
 
 # Create base class for models
 Base = declarative_base()
 
+_engine: Optional[Engine] = None
+replica_set: Optional[ReplicaSet] = None
+recent_writers: Optional[RecentWriters] = None
+
+
+def _create_engine(url: str, app_settings: Settings) -> Engine:
+    from sqlalchemy import create_engine  # Loads the DB driver, keep it off the import path
+
+    return create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=app_settings.debug  # Log SQL queries in debug mode
+    )
+
+
+def init_engine(app_settings: Settings = None) -> Engine:
+    """
+    Create the primary (and replica) engines and bind the session factories
+    Called from the app lifespan; nothing connects to the database at
+    import time. Safe to call more than once.
+    """
+    global _engine, replica_set, recent_writers
+    if _engine is None:
+        app_settings = app_settings or settings
+        _engine = _create_engine(app_settings.database_url, app_settings)
+        SessionLocal.configure(bind=_engine)
+        ReadSessionLocal.configure(bind=_engine)
+
+        if app_settings.database_replica_urls:
+            replica_set = ReplicaSet([
+                _create_engine(url, app_settings) for url in app_settings.database_replica_urls
+            ])
+        if app_settings.database_read_your_writes_seconds > 0:
+            recent_writers = RecentWriters(app_settings.database_read_your_writes_seconds)
+    return _engine
 
-def get_db():
+
+def get_engine() -> Engine:
+    """Return the engine, creating it from the global settings on first use"""
+    return _engine or init_engine()
+
+
+def dispose_engine() -> None:
+    """Close pooled connections and unbind the session factories"""
+    global _engine, replica_set, recent_writers
+    if replica_set is not None:
+        replica_set.dispose()
+        replica_set = None
+    recent_writers = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+        SessionLocal.configure(bind=None)
+        ReadSessionLocal.configure(bind=None)
+
+
+def conflict_insert(db: Session, model):
+    """
+    INSERT for `model` that supports on_conflict_do_nothing() and returning()
+    Returns None on databases without ON CONFLICT (only PostgreSQL and SQLite have it).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _remember_flush(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _remember_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _open_read_your_writes_window(session) -> None:
+    client_key = session.info.get("client_key")
+    if recent_writers is not None and client_key is not None and session.info.pop("wrote", False):
+        recent_writers.mark(client_key)
+
+
+def _client_key(request: Request) -> str:
+    """Identify a client for read-your-writes: a digest of its credentials, else its address"""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()  # Never keep bearer tokens in memory
+    return request.client.host if request.client else "unknown"
+
+
+def get_db(request: Request = None):
     """
     Database dependency - similar to Express.js middleware
-    Use this in FastAPI dependencies to get database session
+    Use this in FastAPI dependencies to get a primary (read-write) session.
+    Committing ORM flushes or insert()/update()/delete() statements opens the
+    client's read-your-writes window; raw text() writes must set db.info["wrote"].
     """
+    if _engine is None:
+        init_engine()
     db = SessionLocal()
+    if recent_writers is not None and request is not None:
+        db.info["client_key"] = _client_key(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request = None):
+    """
+    Read-only database dependency for listing, detail, dashboard and export endpoints
+    Routes queries to a healthy replica (round-robin), falling back to the
+    primary when there are no replicas, none is healthy, or the client
+    wrote within the read-your-writes window.
+    """
+    if _engine is None:
+        init_engine()
+
+    replica = None
+    if replica_set is not None:
+        wrote_recently = (
+            recent_writers is not None
+            and request is not None
+            and recent_writers.is_recent(_client_key(request))
+        )
+        if not wrote_recently:
+            replica = replica_set.choose()
+
+    db = ReadSessionLocal(info={"replica": replica})
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
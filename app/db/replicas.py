@@ -0,0 +1,111 @@
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from sqlalchemy import Delete, Insert, Update, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaSet:
+    """
+    Read replicas with round-robin selection and health tracking
+    A replica is marked down when a health check fails or when one of its
+    connections reports a disconnect, and comes back on the next passing
+    health check. With no healthy replica, reads fall back to the primary.
+    """
+
+    def __init__(self, engines: List[Engine]):
+        self.engines = engines
+        self.healthy = [True] * len(engines)
+        self._counter = itertools.count()
+        for index, engine in enumerate(engines):
+            event.listen(engine, "handle_error", self._on_error(index))
+
+    def choose(self) -> Optional[Engine]:
+        """Return the next healthy replica, or None if all are down"""
+        for _ in range(len(self.engines)):
+            index = next(self._counter) % len(self.engines)
+            if self.healthy[index]:
+                return self.engines[index]
+        return None
+
+    def check_health(self) -> None:
+        """Run SELECT 1 against every replica (blocking, run in a thread)"""
+        for index, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                healthy = True
+            except Exception:
+                healthy = False
+            if healthy != self.healthy[index]:
+                logger.warning("Replica %s is now %s", engine.url.render_as_string(hide_password=True),
+                               "up" if healthy else "down")
+            self.healthy[index] = healthy
+
+    def dispose(self) -> None:
+        for engine in self.engines:
+            engine.dispose()
+
+    def _on_error(self, index: int):
+        def handle_error(context) -> None:
+            if context.is_disconnect:
+                self.healthy[index] = False
+        return handle_error
+
+
+class RecentWriters:
+    """
+    Read-your-writes tracker
+    Remembers clients that committed a write in the last window_seconds so
+    their reads go to the primary until replicas have caught up. State is
+    per worker process and bounded to max_entries (oldest evicted first).
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 10_000):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._until: "OrderedDict[str, float]" = OrderedDict()  # Ordered by expiry, oldest first
+        self._lock = threading.Lock()
+
+    def mark(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._until[key] = now + self.window_seconds
+            self._until.move_to_end(key)
+            while self._until and next(iter(self._until.values())) <= now:
+                self._until.popitem(last=False)
+            while len(self._until) > self.max_entries:
+                self._until.popitem(last=False)  # Evict the oldest writer still inside its window
+
+    def is_recent(self, key: str) -> bool:
+        with self._lock:
+            until = self._until.get(key)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._until[key]
+                return False
+            return True
+
+    def __len__(self) -> int:
+        return len(self._until)
+
+
+class RoutingSession(Session):
+    """
+    Session for read-only dependencies
+    Queries go to the replica stored in session.info["replica"]; flushes
+    and INSERT/UPDATE/DELETE statements always go to the primary bind.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is None or self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        return replica
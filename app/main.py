@@ -1,52 +1,285 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import settings
-from app.api.api import api_router
-
-app = FastAPI(
-    title=settings.app_name,
-    version=settings.app_version,
-    debug=settings.debug,
-    description="A comprehensive FastAPI backend for cyber security applications",
-    docs_url="/docs" if settings.debug else None,
-    redoc_url="/redoc" if settings.debug else None,
-)
-
-# CORS Configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.allowed_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include API routes
-app.include_router(api_router, prefix="/api/v1")
-
-
-@app.get("/")
-async def root():
-    """Root endpoint - health check"""
-    return {
-        "message": f"Welcome to {settings.app_name}",
-        "version": settings.app_version,
-        "environment": settings.environment,
-        "status": "healthy"
-    }
-
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "timestamp": "2025-09-22"}
+from app.core.startup import startup_report
+
+with startup_report.phase("import.fastapi"):
+    import asyncio
+    import logging
+    from contextlib import asynccontextmanager
+    from datetime import datetime
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import PlainTextResponse
+    from starlette.concurrency import run_in_threadpool
+
+with startup_report.phase("import.config"):
+    from app.core.config import Settings, settings as default_settings
+    from app.core.admission import AdmissionController
+    from app.core.metrics import is_scrape_allowed, metrics_registry
+    from app.utils.responses import APIResponse
+
+with startup_report.phase("import.routes"):
+    from app.api.api import api_router
+
+with startup_report.phase("import.middleware"):
+    from app.middleware.admission import AdmissionControlMiddleware
+    from app.middleware.compression import CompressionMiddleware
+    from app.middleware.metrics import MetricsMiddleware
+    from app.middleware.profiling import ProfilingMiddleware
+    from app.middleware.rate_limiting import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+def _register_gauges(engine) -> None:
+    """Register gauges for process-wide resources"""
+    metrics_registry.register_gauge(
+        "rate_limiter_clients",
+        "Client IPs currently tracked by the rate limiter",
+        lambda: len(rate_limiter.clients),
+    )
+    metrics_registry.register_gauge(
+        "db_pool_size",
+        "Configured size of the database connection pool",
+        lambda: engine.pool.size(),
+    )
+    metrics_registry.register_gauge(
+        "db_pool_checked_out",
+        "Database connections currently checked out of the pool",
+        lambda: engine.pool.checkedout(),
+    )
+    metrics_registry.register_gauge(
+        "db_pool_checked_in",
+        "Idle database connections held in the pool",
+        lambda: engine.pool.checkedin(),
+    )
+    from app.core.revocation import revocation_list
+    metrics_registry.register_gauge(
+        "revoked_tokens",
+        "Revoked tokens and per-user cutoffs held until expiry",
+        lambda: len(revocation_list),
+    )
+
+
+def _register_admission_gauges(controller) -> None:
+    """Register gauges for the admission controller's adaptive limit and queue"""
+    metrics_registry.register_gauge(
+        "admission_limit",
+        "Current adaptive concurrency limit",
+        lambda: controller.limit,
+    )
+    metrics_registry.register_gauge(
+        "admission_inflight",
+        "Requests currently admitted",
+        lambda: controller.inflight,
+    )
+    metrics_registry.register_gauge(
+        "admission_queued",
+        "Requests waiting for admission",
+        lambda: controller.queued,
+    )
+    metrics_registry.register_gauge(
+        "admission_rejected",
+        "Requests shed with 503 since startup",
+        lambda: controller.rejected,
+    )
+
+
+def _register_user_cache_gauges() -> None:
+    """Register hit-rate gauges for the AuthService user caches"""
+    from app.services.auth_service import unknown_user_cache, user_cache
+
+    for name, cache in (("user_cache", user_cache), ("unknown_user_cache", unknown_user_cache)):
+        metrics_registry.register_gauge(
+            f"{name}_hit_ratio", f"Hit ratio of the {name.replace('_', ' ')}",
+            lambda cache=cache: cache.stats()["hit_rate"],
+        )
+        metrics_registry.register_gauge(
+            f"{name}_entries", f"Entries held in the {name.replace('_', ' ')}",
+            lambda cache=cache: len(cache),
+        )
+
+
+async def _check_replicas(replica_set, interval: float) -> None:
+    """Periodically health check read replicas off the event loop"""
+    while True:
+        await run_in_threadpool(replica_set.check_health)
+        await asyncio.sleep(interval)
+
+
+async def _reload_geoip(enricher, path: str, interval: float) -> None:
+    """Swap in the GeoIP database whenever the file is replaced"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await run_in_threadpool(enricher.reload_if_changed, path):
+                logger.info("Reloaded GeoIP database %s", path)
+        except (OSError, ValueError) as exc:
+            logger.warning("GeoIP database %s not reloaded: %s", path, exc)
+
+
+async def _expire_revocations(revocations, interval: float = 60.0) -> None:
+    """Drop expired revocations even when no new ones arrive"""
+    while True:
+        await asyncio.sleep(interval)
+        revocations.expire()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan - similar to Express.js server.listen() callback
+    Creates the database engine and other shared resources on startup and
+    releases them on shutdown. Add long-running coroutines to
+    app.state.background_tasks so they are cancelled on shutdown.
+    """
+    app_settings: Settings = app.state.settings
+
+    with startup_report.phase("init.database"):
+        from app.db import database
+        engine = database.init_engine(app_settings)
+
+    replica_set = database.replica_set
+    if replica_set is not None:
+        app.state.background_tasks.append(asyncio.create_task(
+            _check_replicas(replica_set, app_settings.database_replica_health_interval)
+        ))
+        metrics_registry.register_gauge(
+            "db_replicas_healthy",
+            "Read replicas currently passing health checks",
+            lambda: sum(replica_set.healthy),
+        )
+
+    from app.core import revocation
+    app.state.background_tasks.append(asyncio.create_task(_expire_revocations(revocation.revocation_list)))
+    if app_settings.token_revocation_sync:
+        revocation.revocation_sync = revocation.RedisRevocationSync(
+            revocation.revocation_list, app_settings.redis_url, app_settings.token_revocation_key
+        )
+        app.state.background_tasks.append(asyncio.create_task(revocation.revocation_sync.run()))
+
+    if app_settings.geoip_database_path:
+        from app.services.geoip_service import geoip
+        with startup_report.phase("init.geoip"):
+            try:
+                geoip.load(app_settings.geoip_database_path)
+            except (OSError, ValueError) as exc:
+                logger.warning("GeoIP enrichment disabled until the database loads: %s", exc)
+        if app_settings.geoip_reload_interval > 0:
+            app.state.background_tasks.append(asyncio.create_task(_reload_geoip(
+                geoip, app_settings.geoip_database_path, app_settings.geoip_reload_interval
+            )))
+
+    if app_settings.metrics_enabled:
+        _register_gauges(engine)
+        _register_user_cache_gauges()
+        if app.state.admission_controller is not None:
+            _register_admission_gauges(app.state.admission_controller)
+
+    # Pick up bulk user imports left unfinished by a previous shutdown or crash
+    from app.services.user_import_service import user_import_runner
+    resumed_imports = user_import_runner.resume_pending()
+    if resumed_imports:
+        logger.info("Resuming %d user import job(s)", len(resumed_imports))
+
+    startup_report.log(app_settings.startup_budget_ms)
+
+    try:
+        yield
+    finally:
+        for task in app.state.background_tasks:
+            task.cancel()
+        await asyncio.gather(*app.state.background_tasks, return_exceptions=True)
+        app.state.background_tasks.clear()
+        await run_in_threadpool(user_import_runner.shutdown)
+        if revocation.revocation_sync is not None:
+            await revocation.revocation_sync.close()
+            revocation.revocation_sync = None
+        database.dispose_engine()
+
+
+def create_app(settings: Settings = None) -> FastAPI:
+    """
+    Application factory - similar to an Express.js `createApp()` function
+    Builds a FastAPI app from settings without touching the database;
+    connections are created by the lifespan when the server starts.
+    """
+    settings = settings or default_settings
+
+    with startup_report.phase("init.app"):
+        app = FastAPI(
+            title=settings.app_name,
+            version=settings.app_version,
+            debug=settings.debug,
+            description="A comprehensive FastAPI backend for cyber security applications",
+            docs_url="/docs" if settings.debug else None,
+            redoc_url="/redoc" if settings.debug else None,
+            lifespan=lifespan,
+        )
+        app.state.settings = settings
+        app.state.background_tasks = []
+        app.state.startup_report = startup_report
+        app.state.admission_controller = None
+
+        # Load shedding (innermost, so 503s still get CORS headers and are counted in metrics)
+        if settings.admission_enabled:
+            app.state.admission_controller = AdmissionController(settings)
+            app.add_middleware(AdmissionControlMiddleware, controller=app.state.admission_controller)
+
+        # CORS Configuration
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=settings.allowed_origins,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+        # Response compression (gzip, or zstd when the zstandard package is installed)
+        if settings.compression_enabled:
+            app.add_middleware(CompressionMiddleware, app_settings=settings)
+
+        # On-demand request profiling
+        if settings.profiling_enabled:
+            app.add_middleware(ProfilingMiddleware, sample_rate=settings.profiling_sample_rate)
+
+        # Request metrics (outermost so latency covers the full middleware stack)
+        if settings.metrics_enabled:
+            app.add_middleware(MetricsMiddleware)
+
+        # Include API routes
+        app.include_router(api_router, prefix="/api/v1")
+
+        @app.get("/")
+        async def root():
+            """Root endpoint - health check"""
+            return {
+                "message": f"Welcome to {settings.app_name}",
+                "version": settings.app_version,
+                "environment": settings.environment,
+                "status": "healthy"
+            }
+
+        @app.get("/health")
+        async def health_check():
+            """Health check endpoint"""
+            return {"status": "healthy", "timestamp": datetime.utcnow().isoformat() + "Z"}
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics(request: Request):
+            """Prometheus metrics endpoint (restricted to allowed IPs or the metrics token)"""
+            client_host = request.client.host if request.client else None
+            if not is_scrape_allowed(client_host, request.headers.get("authorization")):
+                return APIResponse.forbidden()
+            return PlainTextResponse(
+                metrics_registry.render(),
+                media_type="text/plain; version=0.0.4; charset=utf-8"
+            )
+
+    return app
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=settings.debug
-    )
\ No newline at end of file
+    from app.core.server import serve
+    serve()
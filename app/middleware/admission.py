@@ -0,0 +1,35 @@
+from fastapi import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.admission import AdmissionController, Overloaded
+from app.utils.responses import APIResponse
+
+
+class AdmissionControlMiddleware:
+    """
+    Load shedding middleware - similar to toobusy-js in Express.js
+    Pure ASGI middleware that runs every request through an
+    AdmissionController and answers 503 with Retry-After when the worker
+    is overloaded, instead of letting requests queue until they time out.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or AdmissionController()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.controller.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with self.controller.admit(scope["path"]):
+                await self.app(scope, receive, send)
+        except Overloaded as exc:
+            response = APIResponse.error(
+                message="Server is overloaded, please retry later",
+                error_code="overloaded",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                details={"reason": exc.reason},
+            )
+            response.headers["Retry-After"] = str(exc.retry_after)
+            await response(scope, receive, send)
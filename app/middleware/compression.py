@@ -0,0 +1,187 @@
+import importlib.util
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import Settings, settings as default_settings
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        import zstandard
+
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_block)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+@lru_cache(maxsize=None)
+def available_encodings() -> Tuple[str, ...]:
+    """Supported encodings in server preference order; zstd needs the optional zstandard package"""
+    return ("zstd", "gzip") if importlib.util.find_spec("zstandard") else ("gzip",)
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header (RFC 9110 q-values)
+    The highest q wins; ties go to the server's order in `available`.
+    Returns None when the client accepts none of them.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            weights[coding.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Response compression middleware - similar to the compression package in Express.js
+    Pure ASGI middleware that compresses responses whose content type is in
+    the allowlist and whose body reaches the size threshold, using the best
+    coding the client accepts (zstd when the zstandard package is
+    installed, otherwise gzip). Streaming responses are compressed chunk by
+    chunk and flushed as they go, so exports are never buffered whole.
+    """
+
+    def __init__(self, app: ASGIApp, app_settings: Settings = None):
+        app_settings = app_settings or default_settings
+        self.app = app
+        self.minimum_size = app_settings.compression_minimum_size
+        self.levels = {"gzip": app_settings.compression_gzip_level, "zstd": app_settings.compression_zstd_level}
+        self.content_types = tuple(app_settings.compression_content_types)
+        self.available = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, self.available) if accept_encoding else None
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def _is_compressible(self, headers: MutableHeaders) -> bool:
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return (
+            "content-encoding" not in headers
+            and "content-range" not in headers
+            and any(content_type.startswith(allowed) for allowed in self.content_types)
+        )
+
+    def _encoder(self, encoding: str):
+        if encoding == "zstd":
+            return _ZstdEncoder(self.levels["zstd"])
+        return _GzipEncoder(self.levels["gzip"])
+
+
+class _CompressionResponder:
+    """Per-response state: holds the start message until the first body chunk decides"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._encoder = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            status_code = message["status"]
+            if status_code < 200 or status_code in (204, 304) or not self.middleware._is_compressible(headers):
+                self._passthrough = True
+                await self._send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoding is None:
+                self._passthrough = True
+                await self._send(message)
+                return
+            self._start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self._encoder is None:
+            # Collect up to the threshold before deciding, so small streamed bodies stay plain
+            self._pending.append(body)
+            self._pending_size += len(body)
+            if more_body and self._pending_size < self.middleware.minimum_size:
+                return
+            body, self._pending = b"".join(self._pending), []
+            if self._pending_size < self.middleware.minimum_size:
+                await self._flush_plain(body)
+                return
+            self._encoder = self.middleware._encoder(self.encoding)
+            await self._send_start(streaming=more_body, body=None if more_body else body)
+            if not more_body:
+                return
+
+        if more_body:
+            compressed = self._encoder.compress(body) if body else b""
+            if compressed:
+                await self._send({"type": "http.response.body", "body": compressed, "more_body": True})
+        else:
+            await self._send({"type": "http.response.body", "body": self._encoder.finish(body), "more_body": False})
+
+    async def _flush_plain(self, body: bytes) -> None:
+        self._passthrough = True
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": body, "more_body": False})
+
+    async def _send_start(self, streaming: bool, body: Optional[bytes]) -> None:
+        headers = MutableHeaders(raw=self._start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        if streaming:
+            if "content-length" in headers:
+                del headers["content-length"]
+            await self._send(self._start)
+            return
+        compressed = self._encoder.finish(body)
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": False})
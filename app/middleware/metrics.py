@@ -0,0 +1,61 @@
+import time
+from typing import Any, Dict
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import MetricsRegistry, metrics_registry
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Request metrics middleware - similar to express-prom-bundle in Node.js
+    Pure ASGI middleware that records per-route, per-status latency.
+    Routes are labelled by their path template (e.g. /users/{user_id}) so
+    label cardinality stays bounded no matter which ids are requested.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = None):
+        self.app = app
+        self.registry = registry or metrics_registry
+        self._route_templates: Dict[Any, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.observe_request(
+                scope["method"],
+                self._route_template(scope),
+                status_code,
+                time.perf_counter() - start,
+            )
+
+    def _route_template(self, scope: Scope) -> str:
+        """Resolve the matched route's path template from the routed scope"""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+
+        template = self._route_templates.get(endpoint)
+        if template is None:
+            template = UNMATCHED_ROUTE
+            app = scope.get("app")
+            for route in getattr(app, "routes", ()):
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = route.path
+                    break
+            self._route_templates[endpoint] = template
+        return template
@@ -0,0 +1,84 @@
+import asyncio
+import itertools
+import sys
+import uuid
+from urllib.parse import parse_qs
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.profiling import RequestSampler, current_sampler, finish_profile, verify_profile_signature
+from app.core.security import verify_token
+
+
+class ProfilingMiddleware:
+    """
+    On-demand request profiling middleware
+    A request is profiled when it carries a valid X-Profile-Signature header,
+    when an admin passes ?profile=1, or when it is picked by the continuous
+    1-in-N sampling rate. The collapsed stack file is written to
+    settings.profiling_dir. Only explicitly requested profiles get their id
+    back in the X-Profile-Id header; sampled requests are not told.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: int = None):
+        self.app = app
+        self.sample_rate = settings.profiling_sample_rate if sample_rate is None else sample_rate
+        self._counter = itertools.count(1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = self._is_requested(scope)
+        if not requested and not self._is_sampled():
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        downstream_send = send
+
+        if requested:
+            async def downstream_send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-profile-id", profile_id.encode())
+                    ]
+                await send(message)
+
+        sampler = RequestSampler(marker=sys._getframe(), task=asyncio.current_task())
+        sampler.start()
+        token = current_sampler.set(sampler)
+        try:
+            await self.app(scope, receive, downstream_send)
+        finally:
+            current_sampler.reset(token)
+            sampler.stop()
+            await run_in_threadpool(finish_profile, sampler, profile_id)
+
+    def _is_sampled(self) -> bool:
+        """Continuous 1-in-N sampling"""
+        return self.sample_rate > 0 and next(self._counter) % self.sample_rate == 0
+
+    def _is_requested(self, scope: Scope) -> bool:
+        """Check for a valid signature header or an admin ?profile=1 flag"""
+        headers = Headers(scope=scope)
+        signature = headers.get("x-profile-signature")
+        if signature and verify_profile_signature(signature, scope["path"]):
+            return True
+
+        query_string = scope.get("query_string", b"")
+        if b"profile=" in query_string:
+            if parse_qs(query_string.decode()).get("profile") == ["1"]:
+                return self._is_admin(headers)
+        return False
+
+    @staticmethod
+    def _is_admin(headers: Headers) -> bool:
+        """Check that the request carries a bearer token with the admin role"""
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        payload = verify_token(token)
+        return payload is not None and payload.get("role") == "admin"
@@ -39,8 +39,16 @@ class SecurityEvent(Base):
     endpoint = Column(String(255), nullable=True)
     description = Column(Text, nullable=False)
     
-    # Additional data stored as JSON
-    metadata = Column(JSON, nullable=True)  # Store additional event-specific data
+    # Source IP enrichment from the local GeoIP/ASN database, set at ingestion
+    country_code = Column(String(2), index=True, nullable=True)  # ISO 3166-1 alpha-2
+    asn = Column(Integer, index=True, nullable=True)
+    asn_org = Column(String(255), nullable=True)
+    
+    # Sensor-supplied key; retries of the same event are dropped at ingestion (NULLs never conflict)
+    idempotency_key = Column(String(128), unique=True, index=True, nullable=True)
+    
+    # Additional data stored as JSON ("metadata" is reserved by the Declarative API)
+    event_metadata = Column("metadata", JSON, nullable=True)  # Store additional event-specific data
     
     # File-related fields (for malware detection, etc.)
     file_hash = Column(String(64), nullable=True)  # SHA256 hash
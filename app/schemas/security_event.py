@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+# Mirrors app.models.security_event enums without importing the ORM at startup
+Severity = Literal["low", "medium", "high", "critical"]
+Status = Literal["active", "blocked", "resolved", "investigating", "quarantined"]
+
+
+class SecurityEventCreate(BaseModel):
+    """Security event ingestion schema - what sensors send"""
+    event_type: str = Field(..., max_length=50)
+    severity: Severity = "medium"
+    status: Status = "active"
+    source_ip: Optional[str] = Field(None, max_length=45)
+    user_agent: Optional[str] = None
+    endpoint: Optional[str] = Field(None, max_length=255)
+    description: str
+    metadata: Optional[Dict[str, Any]] = None
+    file_hash: Optional[str] = Field(None, max_length=64)
+    file_name: Optional[str] = Field(None, max_length=255)
+    file_size: Optional[int] = None
+    idempotency_key: Optional[str] = Field(None, min_length=1, max_length=128)  # Same key = same event
+
+
+class SecurityEventBatch(BaseModel):
+    """Batch ingestion schema"""
+    events: List[SecurityEventCreate] = Field(..., min_length=1, max_length=1000)
@@ -1,26 +1,40 @@
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, Iterable, Optional
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.models.user import User
+from app.core.config import settings
 from app.core.security import verify_password, get_password_hash, create_access_token
 from app.schemas.auth import UserRegister
+from app.schemas.user import UserUpdate
+from app.utils.cache import TTLCache
+
+# Cached user column values keyed by ("id" | "username" | "email", value)
+user_cache = TTLCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl)
+# Lookups that found no user, kept apart so enumeration floods cannot evict real users
+unknown_user_cache = TTLCache(
+    maxsize=settings.user_cache_negative_size, ttl=settings.user_cache_negative_ttl
+)
 
 
 class AuthService:
     """
     Authentication service - similar to Express.js service classes
     Handles all authentication-related business logic
+
+    User lookups go through a per-process TTL cache. Every write made
+    through this service invalidates the affected entries; other workers
+    see the change once their entry expires (settings.user_cache_ttl).
     """
-    
+
     @staticmethod
     def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
         """Authenticate user with username and password"""
-        user = db.query(User).filter(User.username == username).first()
+        user = AuthService.get_user_by_username(db, username)
         if not user:
             return None
         if not verify_password(password, user.hashed_password):
             return None
         return user
-    
+
     @staticmethod
     def create_user(db: Session, user_data: UserRegister) -> User:
         """Create new user"""
@@ -34,19 +48,105 @@ class AuthService:
         db.add(db_user)
         db.commit()
         db.refresh(db_user)
+        AuthService.invalidate_user(db_user)
         return db_user
-    
+
+    @staticmethod
+    def update_user(db: Session, user: User, user_data: UserUpdate) -> User:
+        """Update user fields that were explicitly set"""
+        old_username, old_email = user.username, user.email
+        for field, value in user_data.model_dump(exclude_unset=True).items():
+            setattr(user, field, value)
+        db.commit()
+        db.refresh(user)
+        AuthService.invalidate_user(user, old_username=old_username, old_email=old_email)
+        return user
+
+    @staticmethod
+    def set_user_role(db: Session, user: User, role: str) -> User:
+        """Change a user's role"""
+        user.role = role
+        db.commit()
+        db.refresh(user)
+        AuthService.invalidate_user(user)
+        return user
+
+    @staticmethod
+    def deactivate_user(db: Session, user: User) -> User:
+        """Deactivate a user account"""
+        user.is_active = False
+        db.commit()
+        db.refresh(user)
+        AuthService.invalidate_user(user)
+        return user
+
+    @staticmethod
+    def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
+        """Get user by ID"""
+        return AuthService._cached_lookup(db, "id", user_id, lambda: User.id == user_id)
+
     @staticmethod
     def get_user_by_username(db: Session, username: str) -> Optional[User]:
         """Get user by username"""
-        return db.query(User).filter(User.username == username).first()
-    
+        return AuthService._cached_lookup(db, "username", username, lambda: User.username == username)
+
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> Optional[User]:
         """Get user by email"""
-        return db.query(User).filter(User.email == email).first()
-    
+        return AuthService._cached_lookup(db, "email", email, lambda: User.email == email)
+
     @staticmethod
     def generate_access_token(user: User) -> str:
         """Generate access token for user"""
-        return create_access_token(data={"sub": user.username})
\ No newline at end of file
+        return create_access_token(data={"sub": user.username, "role": user.role})
+
+    @staticmethod
+    def invalidate_user(user: User, old_username: str = None, old_email: str = None) -> None:
+        """Drop cached and negative entries for a user, including previous username/email"""
+        keys = [("id", user.id), ("username", user.username), ("email", user.email)]
+        if old_username is not None:
+            keys.append(("username", old_username))
+        if old_email is not None:
+            keys.append(("email", old_email))
+        user_cache.delete(*keys)
+        unknown_user_cache.delete(*keys)
+
+    @staticmethod
+    def invalidate_identities(usernames: Iterable[str], emails: Iterable[str]) -> None:
+        """Drop negative entries for usernames/emails created outside create_user (e.g. bulk import)"""
+        keys = [("username", username) for username in usernames]
+        keys += [("email", email) for email in emails]
+        user_cache.delete(*keys)
+        unknown_user_cache.delete(*keys)
+
+    @staticmethod
+    def cache_stats() -> Dict[str, Dict[str, float]]:
+        """Hit-rate statistics for the user caches"""
+        return {"users": user_cache.stats(), "unknown_users": unknown_user_cache.stats()}
+
+    @staticmethod
+    def _cached_lookup(db: Session, field: str, value: Any, criterion: Callable) -> Optional[User]:
+        """Serve a lookup from the cache, falling back to the database"""
+        key = (field, value)
+        snapshot = user_cache.get(key)
+        if snapshot is not TTLCache.MISSING:
+            return _attach(db, snapshot)
+        if unknown_user_cache.get(key) is not TTLCache.MISSING:
+            return None
+
+        user = db.query(User).filter(criterion()).first()
+        if user is None:
+            unknown_user_cache.set(key, True)
+            return None
+
+        snapshot = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        for cache_key in (("id", user.id), ("username", user.username), ("email", user.email)):
+            user_cache.set(cache_key, snapshot)
+        return user
+
+
+def _attach(db: Session, snapshot: Dict[str, Any]) -> User:
+    """Rebuild a User from cached values and attach it to the session without a query"""
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
@@ -0,0 +1,290 @@
+import ipaddress
+import mmap
+import os
+import socket
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+MAGIC = b"CSIPDB01"
+HEADER = struct.Struct("<8sII")  # magic, IPv4 range count, IPv6 range count
+NO_ORG = 0xFFFFFFFF
+
+
+class GeoInfo(NamedTuple):
+    country_code: Optional[str]
+    asn: Optional[int]
+    asn_org: Optional[str]
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _layout(v4_count: int, v6_count: int) -> Dict[str, Tuple[int, int]]:
+    """Byte (offset, length) of every column; both address families are stored column-wise"""
+    sections, offset = {}, _align(HEADER.size)
+    for family, count, width in (("v4", v4_count, 4), ("v6", v6_count, 16)):
+        for column, size in (("starts", width), ("ends", width), ("asn", 4), ("org", 4), ("country", 2)):
+            sections[f"{family}_{column}"] = (offset, count * size)
+            offset = _align(offset + count * size)
+    sections["strings"] = (offset, 0)
+    return sections
+
+
+def build_ip_database(ranges: Iterable[Tuple[str, str, Optional[str], Optional[int], Optional[str]]], path: str) -> int:
+    """
+    Write an IP range database file from (first_ip, last_ip, country, asn, asn_org) rows
+    The file is written next to `path` and renamed into place, so a running
+    server that reloads it never maps a half-written file. Returns the
+    number of ranges written.
+    """
+    families: Dict[int, list] = {4: [], 6: []}
+    for first, last, country, asn, org in ranges:
+        first_ip, last_ip = ipaddress.ip_address(first), ipaddress.ip_address(last)
+        if first_ip.version != last_ip.version or first_ip > last_ip:
+            raise ValueError(f"Invalid range {first} - {last}")
+        families[first_ip.version].append((int(first_ip), int(last_ip), country, asn, org))
+
+    strings, org_offsets = bytearray(), {}
+    columns: Dict[str, bytes] = {}
+    for version, family in ((4, "v4"), (6, "v6")):
+        rows = sorted(families[version])
+        for previous, current in zip(rows, rows[1:]):
+            if current[0] <= previous[1]:
+                raise ValueError(f"Overlapping ranges at {ipaddress.ip_address(current[0])}")
+        for _, _, _, _, org in rows:
+            if org and org not in org_offsets:
+                encoded = org.encode("utf-8")[:0xFFFF]
+                org_offsets[org] = len(strings)
+                strings += struct.pack("<H", len(encoded)) + encoded
+
+        if version == 4:
+            columns["v4_starts"] = array("I", [row[0] for row in rows])
+            columns["v4_ends"] = array("I", [row[1] for row in rows])
+        else:
+            columns["v6_starts"] = b"".join(row[0].to_bytes(16, "big") for row in rows)
+            columns["v6_ends"] = b"".join(row[1].to_bytes(16, "big") for row in rows)
+        columns[f"{family}_asn"] = array("I", [row[3] or 0 for row in rows])
+        columns[f"{family}_org"] = array("I", [org_offsets[row[4]] if row[4] else NO_ORG for row in rows])
+        columns[f"{family}_country"] = b"".join(
+            (row[2] or "").upper().encode("ascii")[:2].ljust(2, b"\0") for row in rows
+        )
+
+    for name, column in columns.items():
+        if isinstance(column, array) and sys.byteorder != "little":
+            column.byteswap()
+        columns[name] = bytes(column)
+
+    v4_count, v6_count = len(families[4]), len(families[6])
+    layout = _layout(v4_count, v6_count)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as output:
+        output.write(HEADER.pack(MAGIC, v4_count, v6_count))
+        for name, (offset, _) in layout.items():
+            output.write(b"\0" * (offset - output.tell()))
+            output.write(columns.get(name, bytes(strings)))
+    os.replace(temp_path, path)
+    return v4_count + v6_count
+
+
+class IPRangeDatabase:
+    """
+    Read-only IP range database backed by a memory-mapped file
+    Ranges are sorted, non-overlapping and stored column-wise, so a lookup
+    is a binary search over the start addresses (C bisect for IPv4) with
+    nothing parsed up front; pages are loaded by the OS on first touch and
+    shared between worker processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as database_file:
+            self._mmap = mmap.mmap(database_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.v4_count, self.v6_count = HEADER.unpack_from(self._mmap, 0)
+        layout = _layout(self.v4_count, self.v6_count)
+        if magic != MAGIC or layout["strings"][0] > len(self._mmap):
+            self._mmap.close()
+            raise ValueError(f"{path} is not a valid IP range database")
+
+        self._view = memoryview(self._mmap)
+        self._offsets = {name: offset for name, (offset, _) in layout.items()}
+        self._v4_starts = self._integers(layout["v4_starts"])
+        self._v4_ends = self._integers(layout["v4_ends"])
+        self._v4_asn = self._integers(layout["v4_asn"])
+        self._v4_org = self._integers(layout["v4_org"])
+        self._v6_asn = self._integers(layout["v6_asn"])
+        self._v6_org = self._integers(layout["v6_org"])
+
+    def __len__(self) -> int:
+        return self.v4_count + self.v6_count
+
+    def lookup(self, ip: str) -> Optional[GeoInfo]:
+        """Return the range's country/ASN for an IPv4 or IPv6 address, None if unknown or invalid"""
+        try:
+            packed = socket.inet_pton(socket.AF_INET, ip)
+        except (OSError, TypeError):
+            try:
+                packed = socket.inet_pton(socket.AF_INET6, ip)
+            except (OSError, TypeError):
+                return None
+            if packed[:12] == b"\0" * 10 + b"\xff\xff":  # IPv4-mapped IPv6
+                packed = packed[12:]
+        if len(packed) == 4:
+            return self._lookup_v4(int.from_bytes(packed, "big"))
+        return self._lookup_v6(packed)
+
+    def close(self) -> None:
+        for name in ("_v4_starts", "_v4_ends", "_v4_asn", "_v4_org", "_v6_asn", "_v6_org", "_view"):
+            view = getattr(self, name)
+            if isinstance(view, memoryview):
+                view.release()
+        self._mmap.close()
+
+    def _integers(self, section: Tuple[int, int]):
+        offset, length = section
+        if sys.byteorder == "little":
+            return self._view[offset:offset + length].cast("I")
+        values = array("I", self._mmap[offset:offset + length])  # Big-endian hosts copy and swap
+        values.byteswap()
+        return values
+
+    def _lookup_v4(self, address: int) -> Optional[GeoInfo]:
+        index = bisect_right(self._v4_starts, address) - 1
+        if index < 0 or address > self._v4_ends[index]:
+            return None
+        return self._record("v4", index, self._v4_asn[index], self._v4_org[index])
+
+    def _lookup_v6(self, packed: bytes) -> Optional[GeoInfo]:
+        # Big-endian 16-byte keys compare like the integers they encode
+        starts, ends = self._offsets["v6_starts"], self._offsets["v6_ends"]
+        low, high = 0, self.v6_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._mmap[starts + middle * 16:starts + middle * 16 + 16] <= packed:
+                low = middle + 1
+            else:
+                high = middle
+        index = low - 1
+        if index < 0 or packed > self._mmap[ends + index * 16:ends + index * 16 + 16]:
+            return None
+        return self._record("v6", index, self._v6_asn[index], self._v6_org[index])
+
+    def _record(self, family: str, index: int, asn: int, org_offset: int) -> GeoInfo:
+        country_offset = self._offsets[f"{family}_country"] + index * 2
+        country = self._mmap[country_offset:country_offset + 2].rstrip(b"\0").decode("ascii") or None
+        org = None
+        if org_offset != NO_ORG:
+            start = self._offsets["strings"] + org_offset
+            (length,) = struct.unpack_from("<H", self._mmap, start)
+            org = self._mmap[start + 2:start + 2 + length].decode("utf-8")
+        return GeoInfo(country, asn or None, org)
+
+
+class _Loaded(NamedTuple):
+    database: IPRangeDatabase
+    cache: TTLCache
+    signature: Tuple[int, int, int]
+
+
+class GeoIPEnricher:
+    """
+    Country/ASN enrichment for security events - similar to geoip-lite in Node.js
+    Looks up source IPs in a local IPRangeDatabase (no network) through an
+    LRU cache for hot addresses. load() maps the new file and then swaps it
+    in with a single assignment, so lookups never wait or see a mix of
+    files; the old mapping is released once in-flight lookups finish.
+    Replace the file on disk by rename (build_ip_database does), never
+    by rewriting it in place.
+    """
+
+    def __init__(self, cache_size: int = 100_000):
+        self.cache_size = cache_size
+        self._loaded: Optional[_Loaded] = None
+        self._reload_lock = threading.Lock()
+
+    @property
+    def database(self) -> Optional[IPRangeDatabase]:
+        loaded = self._loaded
+        return loaded.database if loaded else None
+
+    def load(self, path: str) -> IPRangeDatabase:
+        """Map a database file and make it current; the previous one keeps serving until then"""
+        with self._reload_lock:
+            signature = _signature(path)
+            database = IPRangeDatabase(path)
+            self._loaded = _Loaded(database, TTLCache(maxsize=self.cache_size, ttl=float("inf")), signature)
+            return database
+
+    def reload_if_changed(self, path: str) -> bool:
+        """Load path if it was replaced since the last load; returns True when swapped"""
+        try:
+            signature = _signature(path)
+        except FileNotFoundError:
+            return False
+        loaded = self._loaded
+        if loaded is not None and loaded.signature == signature and loaded.database.path == path:
+            return False
+        self.load(path)
+        return True
+
+    def lookup(self, ip: Optional[str]) -> Optional[GeoInfo]:
+        loaded = self._loaded
+        if loaded is None or not ip:
+            return None
+        info = loaded.cache.get(ip)
+        if info is TTLCache.MISSING:
+            info = loaded.database.lookup(ip)
+            loaded.cache.set(ip, info)
+        return info
+
+    def enrich(self, event: Dict[str, Any]) -> None:
+        """Set country_code, asn and asn_org on an event row from its source_ip"""
+        info = self.lookup(event.get("source_ip"))
+        if info is not None:
+            event["country_code"], event["asn"], event["asn_org"] = info
+
+    def cache_stats(self) -> Dict[str, float]:
+        loaded = self._loaded
+        return loaded.cache.stats() if loaded else {}
+
+    def unload(self) -> None:
+        self._loaded = None
+
+
+def _signature(path: str) -> Tuple[int, int, int]:
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+# Global enricher, loaded by the app lifespan when GEOIP_DATABASE_PATH is set
+geoip = GeoIPEnricher(cache_size=settings.geoip_cache_size)
+
+
+def _build_from_csv(csv_path: str, output_path: str) -> int:
+    """CSV columns: first_ip,last_ip,country,asn,asn_org (or network,country,asn,asn_org)"""
+    import csv
+
+    def rows():
+        with open(csv_path, newline="") as csv_file:
+            for row in csv.DictReader(csv_file):
+                if row.get("network"):
+                    network = ipaddress.ip_network(row["network"], strict=False)
+                    first, last = str(network[0]), str(network[-1])
+                else:
+                    first, last = row["first_ip"], row["last_ip"]
+                asn = row.get("asn", "").upper().removeprefix("AS")
+                yield first, last, row.get("country") or None, int(asn) if asn else None, row.get("asn_org") or None
+
+    return build_ip_database(rows(), output_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python -m app.services.geoip_service <ranges.csv> <output.ipdb>")
+    print(f"Wrote {_build_from_csv(sys.argv[1], sys.argv[2])} ranges to {sys.argv[2]}")
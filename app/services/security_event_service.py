@@ -0,0 +1,76 @@
+from typing import Any, Dict, List, NamedTuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import conflict_insert
+from app.models.security_event import EventSeverity, EventStatus, SecurityEvent
+from app.services.geoip_service import geoip
+from app.utils.cache import TTLCache
+
+
+class IngestResult(NamedTuple):
+    accepted: int
+    duplicates: int
+
+
+class SecurityEventService:
+    """
+    Security event ingestion - similar to an Express.js service class
+    Events go through enrichment stages and are written with one
+    executemany insert per batch. Events that carry an idempotency_key
+    are deduplicated: keys seen recently by this worker are dropped in
+    memory, and the rest are inserted with ON CONFLICT DO NOTHING against
+    the unique index, so sensor retries never cost a lookup per event.
+    """
+
+    # Recently written keys; bounded and time-windowed, the unique index is the source of truth
+    seen_keys = TTLCache(maxsize=settings.event_dedup_cache_size, ttl=settings.event_dedup_window)
+
+    @staticmethod
+    def ingest_events(db: Session, events: List[Dict[str, Any]]) -> IngestResult:
+        """Enrich and insert events (SecurityEventCreate dicts); returns counts written and dropped"""
+        rows, keys = [], set()
+        for event in events:
+            key = event.get("idempotency_key")
+            if key is not None:
+                if key in keys or SecurityEventService.seen_keys.get(key) is not TTLCache.MISSING:
+                    continue
+                keys.add(key)
+            rows.append(SecurityEventService._to_row(event))
+        if not rows:
+            return IngestResult(0, len(events))
+
+        if not keys:
+            db.execute(insert(SecurityEvent), rows)
+            db.commit()
+            return IngestResult(len(rows), len(events) - len(rows))
+
+        statement = conflict_insert(db, SecurityEvent)
+        if statement is None:
+            # No ON CONFLICT support: a retried key fails the batch on the unique index
+            db.execute(insert(SecurityEvent), rows)
+            written = len(rows)
+        else:
+            statement = (
+                statement
+                .on_conflict_do_nothing(index_elements=[SecurityEvent.idempotency_key])
+                .returning(SecurityEvent.id)
+            )
+            written = len(db.execute(statement, rows).all())  # Only inserted rows are returned
+        db.commit()
+        for key in keys:
+            SecurityEventService.seen_keys.set(key, True)
+        return IngestResult(written, len(events) - written)
+
+    @staticmethod
+    def _to_row(event: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(event)
+        row["event_metadata"] = row.pop("metadata", None)
+        row["severity"] = EventSeverity(row["severity"])
+        row["status"] = EventStatus(row["status"])
+        row.setdefault("idempotency_key", None)
+        row.setdefault("country_code", None)
+        row.setdefault("asn", None)
+        row.setdefault("asn_org", None)
+        geoip.enrich(row)  # country_code, asn, asn_org from source_ip
+        return row
@@ -0,0 +1,357 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.database import conflict_insert
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.services.auth_service import AuthService
+
+IMPORT_FIELDS = ("username", "email", "password", "full_name", "role")
+ALLOWED_ROLES = ("user", "admin", "analyst")
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _hash_workers() -> int:
+    return settings.user_import_workers or os.cpu_count() or 1
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hash passwords across a process pool
+    bcrypt is CPU bound and holds the GIL, so threads would not help.
+    Small inputs are hashed inline to avoid the pool round trip.
+    """
+    global _hash_executor
+    workers = _hash_workers()
+    if len(passwords) < 2 or workers < 2:
+        return [get_password_hash(password) for password in passwords]
+
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(_hash_executor.map(get_password_hash, passwords, chunksize=chunksize))
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=True)
+            _hash_executor = None
+
+
+class UserImportService:
+    """
+    Bulk user import - similar to a CSV import job in an Express.js admin API
+    Rows are processed in batches: validate, check duplicates against the
+    database with one set-based query per batch, hash passwords in
+    parallel, then insert the batch with a single executemany that skips
+    rows a concurrent writer inserted after the check (ON CONFLICT DO NOTHING).
+    """
+
+    @staticmethod
+    def parse_csv(text: str) -> List[Dict[str, Any]]:
+        """Parse CSV with a header row into row dicts"""
+        reader = csv.DictReader(io.StringIO(text))
+        return [
+            {key.strip(): (value or "").strip() for key, value in row.items() if key}
+            for row in reader
+        ]
+
+    @staticmethod
+    def parse_json(payload: Any) -> List[Dict[str, Any]]:
+        """Accept either a list of rows or {"users": [...]}"""
+        if isinstance(payload, dict):
+            payload = payload.get("users")
+        if not isinstance(payload, list) or not all(isinstance(row, dict) for row in payload):
+            raise ValueError('Expected a JSON list of users or {"users": [...]}')
+        return payload
+
+    @staticmethod
+    def import_users(
+        db: Session,
+        rows: List[Dict[str, Any]],
+        start: int = 0,
+        on_batch: Callable[[int, List[Dict[str, Any]]], None] = None,
+        should_stop: Callable[[], bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Import rows[start:] and return one result per processed row
+        on_batch(processed_count, batch_results) is called after each batch
+        is committed; should_stop() is checked between batches.
+        """
+        results: List[Dict[str, Any]] = []
+        batch_size = settings.user_import_batch_size
+
+        for batch_start in range(start, len(rows), batch_size):
+            batch = rows[batch_start:batch_start + batch_size]
+            batch_results = UserImportService._import_batch(db, batch, first_row=batch_start + 1)
+            results.extend(batch_results)
+            if on_batch is not None:
+                on_batch(batch_start + len(batch), batch_results)
+            if should_stop is not None and should_stop():
+                break
+        return results
+
+    @staticmethod
+    def _import_batch(
+        db: Session, batch: List[Dict[str, Any]], first_row: int, retry_on_conflict: bool = True
+    ) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        candidates = []
+        seen_usernames, seen_emails = set(), set()
+
+        for offset, raw in enumerate(batch):
+            row_number = first_row + offset
+            data = {field: raw.get(field) for field in IMPORT_FIELDS if raw.get(field) not in (None, "")}
+            try:
+                user = UserCreate(**data)
+            except ValidationError as exc:
+                error = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
+                )
+                results.append(_result(row_number, data.get("username"), "invalid", error))
+                continue
+            if user.role not in ALLOWED_ROLES:
+                error = f"role: must be one of {', '.join(ALLOWED_ROLES)}"
+                results.append(_result(row_number, user.username, "invalid", error))
+                continue
+            if user.username in seen_usernames or user.email in seen_emails:
+                results.append(_result(row_number, user.username, "duplicate", "Duplicate within import"))
+                continue
+            seen_usernames.add(user.username)
+            seen_emails.add(user.email)
+            candidates.append((row_number, user))
+
+        # One set-based query for the whole batch instead of a lookup per row
+        existing_usernames, existing_emails = set(), set()
+        if candidates:
+            existing = db.execute(
+                select(User.username, User.email).where(or_(
+                    User.username.in_([user.username for _, user in candidates]),
+                    User.email.in_([user.email for _, user in candidates]),
+                ))
+            ).all()
+            existing_usernames = {username for username, _ in existing}
+            existing_emails = {email for _, email in existing}
+
+        new_users = []
+        for row_number, user in candidates:
+            if user.username in existing_usernames or user.email in existing_emails:
+                results.append(_result(row_number, user.username, "duplicate", "Username or email already exists"))
+            else:
+                new_users.append((row_number, user))
+
+        if new_users:
+            hashes = hash_passwords([user.password for _, user in new_users])
+            rows = [
+                {
+                    "username": user.username,
+                    "email": user.email,
+                    "full_name": user.full_name,
+                    "role": user.role,
+                    "hashed_password": hashed_password,
+                    "is_active": True,
+                }
+                for (_, user), hashed_password in zip(new_users, hashes)
+            ]
+            statement = conflict_insert(db, User)
+            if statement is None:
+                try:
+                    db.execute(insert(User), rows)
+                    db.commit()
+                except IntegrityError:
+                    # Another writer took a username/email since the check; re-check the batch once
+                    db.rollback()
+                    if not retry_on_conflict:
+                        raise
+                    return UserImportService._import_batch(db, batch, first_row, retry_on_conflict=False)
+                created = {user.username for _, user in new_users}
+            else:
+                # Rows that lost a race with a concurrent insert are skipped, not fatal for the batch
+                statement = statement.on_conflict_do_nothing().returning(User.username)
+                created = set(db.execute(statement, rows).scalars())
+                db.commit()
+            AuthService.invalidate_identities(
+                [user.username for _, user in new_users], [user.email for _, user in new_users]
+            )
+            for row_number, user in new_users:
+                if user.username in created:
+                    results.append(_result(row_number, user.username, "created"))
+                else:
+                    results.append(_result(row_number, user.username, "duplicate", "Username or email already exists"))
+
+        results.sort(key=lambda result: result["row"])
+        return results
+
+
+def _result(row: int, username: Optional[str], status: str, error: str = None) -> Dict[str, Any]:
+    result = {"row": row, "username": username, "status": status}
+    if error:
+        result["error"] = error
+    return result
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    summary = {"created": 0, "duplicate": 0, "invalid": 0}
+    for result in results:
+        summary[result["status"]] += 1
+    return summary
+
+
+class UserImportJobRunner:
+    """
+    Resumable background import jobs
+    Each job keeps its input (<id>.input.json, mode 0600, deleted when the
+    job finishes) and its progress (<id>.json) in settings.user_import_dir.
+    Progress is saved after every committed batch, so a job interrupted by
+    shutdown or a crash resumes at the next batch on startup. A batch that
+    was committed but not yet recorded is re-run and its rows come back
+    as duplicates. A per-job file lock keeps workers from running the same job.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return settings.user_import_dir
+
+    def submit(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store a new job and queue it"""
+        os.makedirs(self.directory, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        input_path = self._path(job_id, ".input.json")
+        descriptor = os.open(input_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "w") as input_file:
+            json.dump(rows, input_file)
+
+        state = {
+            "id": job_id,
+            "status": "pending",
+            "total": len(rows),
+            "processed": 0,
+            "summary": summarize([]),
+            "results": [],
+            "error": None,
+        }
+        self._save(state)
+        self._queue(job_id)
+        return state
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not job_id.isalnum():
+            return None
+        try:
+            with open(self._path(job_id, ".json")) as state_file:
+                return json.load(state_file)
+        except FileNotFoundError:
+            return None
+
+    def resume_pending(self) -> List[str]:
+        """Queue every job that has not finished; called on startup"""
+        if not os.path.isdir(self.directory):
+            return []
+        resumed = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(".json") and not name.endswith(".input.json"):
+                state = self.get(name[:-len(".json")])
+                if state and state["status"] in ("pending", "running", "interrupted"):
+                    self._queue(state["id"])
+                    resumed.append(state["id"])
+        return resumed
+
+    def shutdown(self) -> None:
+        """Stop after the current batch; unfinished jobs resume on next startup"""
+        self._stopping.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        shutdown_hash_pool()
+        self._stopping.clear()
+
+    def _queue(self, job_id: str) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="user-import")
+            self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> None:
+        import fcntl
+        from app.db import database
+
+        with open(self._path(job_id, ".lock"), "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # Another worker process owns this job
+
+            state = self.get(job_id)
+            if state is None or state["status"] in ("completed", "failed"):
+                return
+
+            state["status"] = "running"
+            self._save(state)
+
+            def on_batch(processed: int, batch_results: List[Dict[str, Any]]) -> None:
+                state["processed"] = processed
+                state["results"].extend(batch_results)
+                state["summary"] = summarize(state["results"])
+                self._save(state)
+
+            database.get_engine()
+            db = database.SessionLocal()
+            try:
+                with open(self._path(job_id, ".input.json")) as input_file:
+                    rows = json.load(input_file)
+                UserImportService.import_users(
+                    db, rows, start=state["processed"], on_batch=on_batch,
+                    should_stop=self._stopping.is_set,
+                )
+                if state["processed"] >= state["total"]:
+                    state["status"] = "completed"
+                    os.remove(self._path(job_id, ".input.json"))
+                else:
+                    state["status"] = "interrupted"
+            except Exception as exc:
+                db.rollback()
+                state["status"] = "failed"
+                state["error"] = str(exc)
+            finally:
+                db.close()
+                self._save(state)
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{job_id}{suffix}")
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        """Write job state atomically so readers never see a partial file"""
+        path = self._path(state["id"], ".json")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as state_file:
+            json.dump(state, state_file)
+        os.replace(temp_path, path)
+
+
+# Global job runner instance
+user_import_runner = UserImportJobRunner()
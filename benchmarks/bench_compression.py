@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Response compression: bytes saved vs CPU spent
+Builds security event pages shaped like GET /api/v1/security/events
+responses at several sizes and, for each encoder/level the middleware can
+use, reports:
+  - compression ratio and bytes saved per response
+  - CPU time per response and throughput (MB/s of JSON in)
+  - net time saved per response on a --link-mbps client link
+    (transfer time saved minus compression time)
+
+zstd rows are shown only when the optional zstandard package is installed.
+
+Usage:
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --link-mbps 10 --repeat 50
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.middleware.compression import _GzipEncoder, _ZstdEncoder, available_encodings
+
+EVENT_TYPES = ["port_scan", "brute_force", "malware", "sql_injection", "xss_attempt", "ddos"]
+SEVERITIES = ["low", "medium", "high", "critical"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="events per page")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--link-mbps", type=float, default=50.0, help="client bandwidth for the net-saving column")
+    return parser.parse_args()
+
+
+def event_page(count: int, rng: random.Random) -> bytes:
+    events = [
+        {
+            "id": i,
+            "event_type": rng.choice(EVENT_TYPES),
+            "severity": rng.choice(SEVERITIES),
+            "status": "open",
+            "source_ip": f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            "destination_ip": f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            "description": f"Suspicious {rng.choice(EVENT_TYPES).replace('_', ' ')} activity detected",
+            "country_code": rng.choice(["US", "DE", "CN", "RU", "BR"]),
+            "asn": rng.randint(1000, 65000),
+            "created_at": f"2024-01-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+        }
+        for i in range(count)
+    ]
+    return json.dumps({"success": True, "message": "Events retrieved", "data": events}).encode()
+
+
+def encoders():
+    for level in (1, 6, 9):
+        yield f"gzip-{level}", lambda level=level: _GzipEncoder(level)
+    if "zstd" in available_encodings():
+        for level in (1, 3, 10):
+            yield f"zstd-{level}", lambda level=level: _ZstdEncoder(level)
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(42)
+    link_bytes_per_second = args.link_mbps * 1_000_000 / 8
+    print(f"{'events':>7} {'encoder':<8} {'bytes':>10} {'compressed':>11} {'ratio':>6} "
+          f"{'cpu ms':>8} {'MB/s':>8} {'net ms saved':>13}")
+    for size in args.sizes:
+        body = event_page(size, rng)
+        for name, factory in encoders():
+            start = time.process_time()
+            for _ in range(args.repeat):
+                compressed = factory().finish(body)
+            cpu = (time.process_time() - start) / args.repeat
+            saved = len(body) - len(compressed)
+            net_saved = saved / link_bytes_per_second - cpu
+            print(f"{size:>7} {name:<8} {len(body):>10,} {len(compressed):>11,} {len(body) / len(compressed):>6.1f} "
+                  f"{cpu * 1000:>8.3f} {len(body) / cpu / 1_000_000 if cpu else float('inf'):>8.0f} "
+                  f"{net_saved * 1000:>13.2f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+GeoIP/ASN lookup throughput
+Builds a synthetic IP range database (non-overlapping IPv4 and IPv6
+ranges with a few thousand ASNs) in a temp directory, then reports
+lookups per second for:
+  - raw IPRangeDatabase lookups on random IPv4 / IPv6 addresses (no cache)
+  - GeoIPEnricher lookups on a skewed workload where --hot-share of events
+    come from --hot-ips addresses (what sensors see during a scan/attack)
+
+Usage:
+    python benchmarks/bench_geoip.py
+    python benchmarks/bench_geoip.py --v4-ranges 1000000 --lookups 500000
+"""
+
+import argparse
+import ipaddress
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.geoip_service import GeoIPEnricher, IPRangeDatabase, build_ip_database
+
+COUNTRIES = ["US", "DE", "CN", "RU", "BR", "IN", "GB", "FR", "JP", "NL"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--v4-ranges", type=int, default=500_000)
+    parser.add_argument("--v6-ranges", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--hot-ips", type=int, default=1_000)
+    parser.add_argument("--hot-share", type=float, default=0.9)
+    return parser.parse_args()
+
+
+def synthetic_ranges(v4_count: int, v6_count: int, rng: random.Random):
+    v4_step = (2 ** 32) // v4_count
+    for i in range(v4_count):
+        start = i * v4_step
+        yield (str(ipaddress.IPv4Address(start)), str(ipaddress.IPv4Address(start + v4_step - 2)),
+               rng.choice(COUNTRIES), 1000 + i % 5000, f"AS Org {i % 5000}")
+    v6_base, v6_step = int(ipaddress.IPv6Address("2000::")), 2 ** 96
+    for i in range(v6_count):
+        start = v6_base + i * v6_step
+        yield (str(ipaddress.IPv6Address(start)), str(ipaddress.IPv6Address(start + v6_step - 1)),
+               rng.choice(COUNTRIES), 1000 + i % 5000, f"AS Org {i % 5000}")
+
+
+def rate(function, addresses) -> float:
+    start = time.perf_counter()
+    for address in addresses:
+        function(address)
+    return len(addresses) / (time.perf_counter() - start)
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.ipdb")
+        start = time.perf_counter()
+        build_ip_database(synthetic_ranges(args.v4_ranges, args.v6_ranges, rng), path)
+        print(f"built {args.v4_ranges + args.v6_ranges} ranges in {time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(path) / 1024 / 1024:.1f} MiB)")
+
+        start = time.perf_counter()
+        database = IPRangeDatabase(path)
+        print(f"mapped in {(time.perf_counter() - start) * 1000:.2f} ms\n")
+
+        v4 = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(args.lookups)]
+        v6 = [str(ipaddress.IPv6Address(int(ipaddress.IPv6Address("2000::")) + rng.getrandbits(100)))
+              for _ in range(args.lookups // 4)]
+        hot = v4[:args.hot_ips]
+        skewed = [rng.choice(hot) if rng.random() < args.hot_share else address for address in v4]
+
+        enricher = GeoIPEnricher(cache_size=100_000)
+        enricher.load(path)
+        print(f"{'uncached IPv4':<28}{rate(database.lookup, v4):>12,.0f} lookups/s")
+        print(f"{'uncached IPv6':<28}{rate(database.lookup, v6):>12,.0f} lookups/s")
+        skewed_rate = rate(enricher.lookup, skewed)
+        hit_rate = enricher.cache_stats()["hit_rate"]
+        print(f"{'cached, skewed IPv4':<28}{skewed_rate:>12,.0f} lookups/s (hit rate {hit_rate:.0%})")
+        enricher.unload()
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Measure the per-request overhead of MetricsMiddleware
+Drives a no-op ASGI app directly (no network, no routing) with and
+without the middleware and reports the difference in microseconds.
+
+Usage: python benchmarks/bench_metrics.py [iterations]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.metrics import MetricsRegistry
+from app.middleware.metrics import MetricsMiddleware
+
+
+async def endpoint():
+    """Stand-in for a routed endpoint"""
+
+
+class NoopApp:
+    """Minimal ASGI app that mimics a routed scope and sends a 200"""
+
+    routes = ()
+
+    async def __call__(self, scope, receive, send):
+        scope["endpoint"] = endpoint
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def run(app, iterations: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/bench"}
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    bare = NoopApp()
+    wrapped = MetricsMiddleware(bare, registry=MetricsRegistry())
+
+    # Warm up both paths so route template caching is not measured
+    asyncio.run(run(wrapped, 1_000))
+
+    bare_time = asyncio.run(run(bare, iterations))
+    wrapped_time = asyncio.run(run(wrapped, iterations))
+    overhead_us = (wrapped_time - bare_time) / iterations * 1_000_000
+
+    print(f"iterations:         {iterations}")
+    print(f"bare per request:   {bare_time / iterations * 1_000_000:.2f} us")
+    print(f"with metrics:       {wrapped_time / iterations * 1_000_000:.2f} us")
+    print(f"metrics overhead:   {overhead_us:.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
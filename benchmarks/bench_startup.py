@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Measure cold start time of the app
+Runs a fresh interpreter per iteration that imports app.main, builds the
+app and runs the lifespan startup, then prints the per-phase breakdown
+from the startup report. Exits with status 1 when the median total
+exceeds the budget (defaults to settings.startup_budget_ms).
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--budget-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app, startup_report
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(boot())
+report = startup_report.as_dict()
+report["wall_ms"] = round((time.perf_counter() - start) * 1000, 2)
+print(json.dumps(report))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app cold start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")  # Cold start must not depend on a reachable DB
+    env.setdefault("DEBUG", "False")
+
+    reports = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD], cwd=ROOT, env=env,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        report = json.loads(output.strip().splitlines()[-1])
+        report["process_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        reports.append(report)
+
+    median_total = statistics.median(report["total_ms"] for report in reports)
+    print(f"{'phase':<22} {'median ms':>10}")
+    for phase in reports[0]["phases"]:
+        print(f"{phase:<22} {statistics.median(r['phases'][phase] for r in reports):>10.1f}")
+    print(f"{'total (phases)':<22} {median_total:>10.1f}")
+    print(f"{'interpreter + app':<22} {statistics.median(r['process_ms'] for r in reports):>10.1f}")
+
+    budget = args.budget_ms
+    if budget is None:
+        sys.path.insert(0, ROOT)
+        from app.core.config import settings
+        budget = settings.startup_budget_ms
+    if median_total > budget:
+        print(f"Cold start {median_total:.1f}ms exceeds budget {budget:.1f}ms")
+        sys.exit(1)
+    print(f"Within budget of {budget:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
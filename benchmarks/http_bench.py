@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+In-process HTTP benchmark suite
+Drives the ASGI app through httpx.AsyncClient (no sockets, no server),
+seeds a throwaway SQLite database with configurable data volumes and
+reports throughput and p50/p99 latency per endpoint.
+
+Usage:
+    python benchmarks/http_bench.py --requests 500 --concurrency 20
+    python benchmarks/http_bench.py --output results.json --baseline benchmarks/baseline.json
+    python benchmarks/http_bench.py --output benchmarks/baseline.json   # refresh the baseline
+
+Exits with status 1 when any endpoint regresses past --threshold
+relative to the baseline.
+
+Note: security_events, security_event, security_dashboard and users still
+serve hardcoded demo data and do not read the seeded tables, so their
+numbers measure routing/middleware/serialization overhead only and
+--users/--events do not affect them. Do not rely on this suite to catch
+database query regressions until those endpoints query the database.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Endpoint name -> (method, path, needs auth)
+ENDPOINTS = {
+    "login": ("POST", "/api/v1/auth/login", False),
+    "security_events": ("GET", "/api/v1/security/events?limit=50", True),
+    "security_event": ("GET", "/api/v1/security/events/1", True),
+    "security_dashboard": ("GET", "/api/v1/security/dashboard", True),
+    "users": ("GET", "/api/v1/users/", True),
+    "health": ("GET", "/health", False),
+}
+LOGIN_FORM = {"username": "admin", "password": "secret"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", default="login,security_events,security_dashboard",
+                        help=f"Comma-separated endpoints to run: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint")
+    parser.add_argument("--login-requests", type=int, default=20,
+                        help="Requests for login (bcrypt makes it ~1000x slower than the rest)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight requests")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed requests per endpoint")
+    parser.add_argument("--users", type=int, default=100,
+                        help="Users to seed (not yet read by any benchmarked endpoint)")
+    parser.add_argument("--events", type=int, default=10_000,
+                        help="Security events to seed (not yet read by any benchmarked endpoint)")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Compare against this JSON results file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative regression before failing (0.25 = 25%%)")
+    return parser.parse_args()
+
+
+def configure_database(directory: str) -> None:
+    """Point the app at a fresh SQLite file; must run before the app is imported"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    os.environ["DEBUG"] = "False"  # Disable SQL echo and reload
+
+
+def seed_database(users: int, events: int) -> None:
+    """Create tables and bulk insert users and security events"""
+    from app.core.security import get_password_hash
+    from app.db.database import Base, get_engine
+    from app.models.security_event import EventSeverity, EventStatus, SecurityEvent
+    from app.models.user import User
+
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+    hashed_password = get_password_hash("secret")  # Hash once, bcrypt is not what we measure here
+    now = datetime.utcnow()
+    rng = random.Random(42)
+
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert(), [
+            {
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "hashed_password": hashed_password,
+                "role": "admin" if i == 0 else "user",
+                "is_active": True,
+            }
+            for i in range(users)
+        ])
+
+        event_types = ["login_attempt", "malware_detection", "unauthorized_access", "port_scan"]
+        batch = []
+        for i in range(events):
+            batch.append({
+                "event_type": rng.choice(event_types),
+                "severity": rng.choice(list(EventSeverity)),
+                "status": rng.choice(list(EventStatus)),
+                "source_ip": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                "description": "Seeded benchmark event",
+                "metadata": {"seq": i},
+                "created_at": now - timedelta(seconds=i),
+            })
+            if len(batch) == 5_000:
+                connection.execute(SecurityEvent.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(SecurityEvent.__table__.insert(), batch)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_endpoint(client, name: str, headers: Dict[str, str], total: int,
+                       concurrency: int, warmup: int) -> Dict[str, float]:
+    """Run total requests against one endpoint with a fixed number of workers"""
+    method, path, needs_auth = ENDPOINTS[name]
+    request_headers = headers if needs_auth else {}
+    form = LOGIN_FORM if name == "login" else None
+
+    async def one_request() -> int:
+        response = await client.request(method, path, headers=request_headers, data=form)
+        return response.status_code
+
+    for _ in range(warmup):
+        await one_request()
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            status_code = await one_request()
+            latencies.append(time.perf_counter() - start)
+            if status_code >= 400:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / wall, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def run_suite(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/v1/auth/login", data=LOGIN_FORM)
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+        results = {}
+        for name in args.endpoints.split(","):
+            name = name.strip()
+            if name not in ENDPOINTS:
+                raise SystemExit(f"Unknown endpoint '{name}', choose from: {', '.join(ENDPOINTS)}")
+            total = args.login_requests if name == "login" else args.requests
+            results[name] = await run_endpoint(
+                client, name, headers, total, args.concurrency, args.warmup if name != "login" else 1
+            )
+            print(f"{name:<20} {results[name]['throughput_rps']:>10.1f} req/s  "
+                  f"p50 {results[name]['p50_ms']:>8.2f} ms  p99 {results[name]['p99_ms']:>8.2f} ms  "
+                  f"errors {results[name]['errors']}")
+        return results
+
+
+def compare_with_baseline(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return human readable regressions against the baseline"""
+    regressions = []
+    for name, current in results.items():
+        expected = baseline.get("endpoints", {}).get(name)
+        if not expected:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if current[metric] > expected[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {current[metric]} > baseline {expected[metric]}")
+        if current["throughput_rps"] < expected["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput_rps {current['throughput_rps']} < baseline {expected['throughput_rps']}"
+            )
+    return regressions
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_database(directory)
+        seed_database(args.users, args.events)
+        results = asyncio.run(run_suite(args))
+
+    report = {
+        "config": {
+            "requests": args.requests,
+            "login_requests": args.login_requests,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "events": args.events,
+        },
+        "endpoints": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print("Performance regressions detected:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
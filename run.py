@@ -1,17 +1,14 @@
 #!/usr/bin/env python3
 """
-Simple script to run the FastAPI development server
+Simple script to run the FastAPI server
 Alternative to using uvicorn command directly
+
+Development (default): single process with auto-reload when DEBUG=True
+Production (ENVIRONMENT=production): multi-worker supervisor configured by
+the SERVER_* settings; send SIGHUP for a rolling restart
 """
 
-import uvicorn
-from app.core.config import settings
+from app.core.server import serve
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=settings.debug,
-        log_level="info" if not settings.debug else "debug"
-    )
\ No newline at end of file
+    serve()
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from app.core.admission import AdmissionController, Overloaded
+from app.core.config import Settings
+from app.middleware.admission import AdmissionControlMiddleware
+
+
+def _controller(**overrides):
+    values = {
+        "admission_initial_limit": 2,
+        "admission_min_limit": 1,
+        "admission_queue_timeouts": {"high": 0.5, "normal": 0.5, "low": 0.05},
+        "admission_route_limits": {"/api/v1/users/import": 1},
+    }
+    values.update(overrides)
+    return AdmissionController(Settings(**values))
+
+
+def test_classify_uses_longest_prefix():
+    controller = _controller(admission_priority_routes={"/api": "low", "/api/v1/auth": "high"})
+
+    assert controller.classify("/api/v1/auth/login") == ("high", None)
+    assert controller.classify("/api/v1/users/") == ("low", None)
+    assert controller.classify("/other") == ("normal", None)
+    assert controller.classify("/api/v1/users/import/abc")[1] == "/api/v1/users/import"
+
+
+def test_low_priority_is_shed_first():
+    controller = _controller()
+
+    async def scenario():
+        async with controller.admit("/api/v1/security/dashboard"):  # Low: half of limit 2
+            with pytest.raises(Overloaded) as shed:
+                async with controller.admit("/api/v1/security/dashboard"):
+                    pass
+            async with controller.admit("/api/v1/security/events"):  # High still fits
+                assert controller.inflight == 2
+        return shed.value
+
+    shed = asyncio.run(scenario())
+
+    assert shed.reason == "queue deadline exceeded"
+    assert shed.retry_after >= 1
+    assert controller.rejected == 1
+
+
+def test_queued_high_priority_is_granted_first():
+    controller = _controller(admission_initial_limit=1)
+    order = []
+
+    async def request(path, name):
+        async with controller.admit(path):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        first = asyncio.create_task(request("/other", "first"))
+        await asyncio.sleep(0)
+        normal = asyncio.create_task(request("/other", "normal"))
+        await asyncio.sleep(0)
+        high = asyncio.create_task(request("/api/v1/auth/login", "high"))
+        await asyncio.gather(first, normal, high)
+
+    asyncio.run(scenario())
+
+    assert order == ["first", "high", "normal"]
+
+
+def test_route_concurrency_limit():
+    controller = _controller(admission_initial_limit=10, admission_queue_timeouts={"normal": 0.05})
+
+    async def scenario():
+        async with controller.admit("/api/v1/users/import"):
+            async with controller.admit("/other"):
+                pass
+            with pytest.raises(Overloaded):
+                async with controller.admit("/api/v1/users/import"):
+                    pass
+
+    asyncio.run(scenario())
+
+
+def test_limit_adapts_to_latency():
+    controller = _controller(admission_initial_limit=20, admission_max_limit=100)
+    controller.inflight = 20  # Limit fully used
+
+    for _ in range(100):
+        controller._observe(0.01)
+    grown = controller.limit
+    for _ in range(300):
+        controller._observe(0.1)
+
+    assert grown > 20
+    assert controller.limit < grown / 2
+    assert controller.long_latency == pytest.approx(0.01)  # Baseline does not drift up
+
+
+def test_middleware_returns_503_with_retry_after():
+    controller = _controller(admission_initial_limit=1, admission_queue_timeouts={"normal": 0.01})
+    release = asyncio.Event()
+    statuses, headers = [], {}
+
+    async def app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+            headers.update({key.decode(): value.decode() for key, value in message["headers"]})
+            release.set()
+
+    middleware = AdmissionControlMiddleware(app, controller)
+
+    async def scenario():
+        scope = {"type": "http", "method": "GET", "path": "/other", "headers": []}
+        await asyncio.gather(
+            middleware(dict(scope), receive, send),
+            middleware(dict(scope), receive, send),
+            middleware({**scope, "path": "/health"}, receive, send),  # Exempt
+        )
+
+    asyncio.run(scenario())
+
+    assert statuses == [503, 200, 200]
+    assert int(headers["retry-after"]) >= 1
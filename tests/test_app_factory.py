@@ -0,0 +1,36 @@
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from app.core.config import Settings
+from app.db import database
+from app.main import create_app
+
+
+def test_import_does_not_load_heavy_modules():
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('sqlalchemy', 'passlib', 'jose') if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_create_app_uses_given_settings():
+    app = create_app(Settings(app_name="Factory Test", debug=False, metrics_enabled=False))
+
+    response = TestClient(app).get("/")
+
+    assert response.json()["message"] == "Welcome to Factory Test"
+    assert app.docs_url is None
+
+
+def test_lifespan_creates_and_disposes_engine(tmp_path):
+    database.dispose_engine()
+    app = create_app(Settings(database_url=f"sqlite:///{tmp_path / 'app.db'}", debug=False))
+
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        assert str(database.get_engine().url).endswith("app.db")
+        assert "init.database" in app.state.startup_report.as_dict()["phases"]
+
+    assert database._engine is None
@@ -0,0 +1,100 @@
+import time
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.database import Base
+from app.models.user import User
+from app.schemas.auth import UserRegister
+from app.schemas.user import UserUpdate
+from app.services import auth_service
+from app.services.auth_service import AuthService
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[User.__table__])
+    engine.query_count = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*args):
+        engine.query_count += 1
+
+    auth_service.user_cache.clear()
+    auth_service.unknown_user_cache.clear()
+    session = sessionmaker(bind=engine)()
+    session.add(User(username="alice", email="alice@example.com", hashed_password="x", role="user"))
+    session.commit()
+    session.close()
+    engine.query_count = 0
+
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_ttl_cache_evicts_lru_and_expires():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # Evicts "b", the least recently used
+    cache.set("short", 4, ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("b") is TTLCache.MISSING
+    assert cache.get("short") is TTLCache.MISSING
+    assert cache.stats()["evictions"] == 2
+
+
+def test_repeated_lookups_hit_cache(db):
+    first = AuthService.get_user_by_username(db, "alice")
+    queries_after_first = db.bind.query_count
+    db.expunge_all()  # Simulate a new request's session
+
+    by_name = AuthService.get_user_by_username(db, "alice")
+    by_email = AuthService.get_user_by_email(db, "alice@example.com")
+    by_id = AuthService.get_user_by_id(db, first.id)
+
+    assert db.bind.query_count == queries_after_first
+    assert by_name is by_email is by_id
+    assert by_name.email == "alice@example.com"
+    assert AuthService.cache_stats()["users"]["hits"] == 3
+
+
+def test_unknown_username_is_negatively_cached(db):
+    assert AuthService.get_user_by_username(db, "ghost") is None
+    queries = db.bind.query_count
+
+    assert AuthService.get_user_by_username(db, "ghost") is None
+    assert db.bind.query_count == queries
+
+
+def test_create_user_clears_negative_entry(db, monkeypatch):
+    monkeypatch.setattr(auth_service, "get_password_hash", lambda password: "hashed")
+    assert AuthService.get_user_by_username(db, "bob") is None
+
+    AuthService.create_user(db, UserRegister(username="bob", email="bob@example.com", password="pw"))
+
+    assert AuthService.get_user_by_username(db, "bob").email == "bob@example.com"
+
+
+def test_writes_invalidate_cached_user(db):
+    user = AuthService.get_user_by_username(db, "alice")
+
+    AuthService.set_user_role(db, user, "admin")
+    db.expunge_all()
+    assert AuthService.get_user_by_username(db, "alice").role == "admin"
+
+    user = AuthService.get_user_by_username(db, "alice")
+    AuthService.deactivate_user(db, user)
+    db.expunge_all()
+    assert AuthService.get_user_by_username(db, "alice").is_active is False
+
+    user = AuthService.get_user_by_username(db, "alice")
+    AuthService.update_user(db, user, UserUpdate(username="alice2"))
+    db.expunge_all()
+    assert AuthService.get_user_by_username(db, "alice") is None
+    assert AuthService.get_user_by_username(db, "alice2").email == "alice@example.com"
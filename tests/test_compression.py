@@ -0,0 +1,109 @@
+import asyncio
+import json
+import zlib
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+from fastapi.testclient import TestClient
+from app.core.config import Settings
+from app.middleware.compression import CompressionMiddleware, negotiate_encoding
+
+EVENTS = [{"id": i, "event_type": "port_scan", "severity": "high", "source_ip": f"10.0.0.{i % 255}"} for i in range(200)]
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "gzip"),
+    ("gzip;q=0.5, zstd", "zstd"),
+    ("gzip, zstd;q=0.5", "gzip"),
+    ("*", "zstd"),
+    ("*;q=0, gzip", "gzip"),
+    ("identity", None),
+    ("gzip;q=0", None),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header, ("zstd", "gzip")) == expected
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/events")
+    def events():
+        return JSONResponse(EVENTS)
+
+    @app.get("/small")
+    def small():
+        return JSONResponse({"ok": True})
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    app.add_middleware(CompressionMiddleware, app_settings=Settings(compression_minimum_size=500))
+    return TestClient(app)
+
+
+def test_large_json_is_gzipped(client):
+    response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(json.dumps(EVENTS)) / 5
+    assert response.json() == EVENTS  # httpx decodes gzip
+
+
+def test_small_and_binary_responses_are_not_compressed(client):
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/events", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in image.headers
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+
+def _stream(middleware, accept_encoding):
+    """Run a streamed response through the middleware and collect the messages it sends"""
+    chunks = [json.dumps(event).encode() + b"\n" for event in EVENTS]
+    messages = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")]})
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/export",
+             "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(middleware(app)(scope, None, send))
+    return b"".join(chunks), messages
+
+
+def test_streaming_response_is_compressed_incrementally():
+    original, messages = _stream(
+        lambda app: CompressionMiddleware(app, Settings(compression_minimum_size=500)), "gzip"
+    )
+
+    headers = dict(messages[0]["headers"])
+    bodies = [message["body"] for message in messages[1:]]
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    assert len(bodies) > 10  # Flushed as it streamed, not buffered into one body
+    assert zlib.decompress(b"".join(bodies), 31) == original
+
+
+def test_streaming_response_uses_zstd_when_available():
+    zstandard = pytest.importorskip("zstandard")
+    original, messages = _stream(
+        lambda app: CompressionMiddleware(app, Settings(compression_minimum_size=500)), "zstd, gzip"
+    )
+
+    assert dict(messages[0]["headers"])[b"content-encoding"] == b"zstd"
+    compressed = b"".join(message["body"] for message in messages[1:])
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(compressed) == original
@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from app.core.config import Settings
+from app.core.security import create_access_token
+from app.db import database
+from app.main import create_app
+from app.models.security_event import SecurityEvent
+from app.services.security_event_service import SecurityEventService
+
+
+@pytest.fixture
+def engine(tmp_path):
+    database.dispose_engine()
+    settings = Settings(database_url=f"sqlite:///{tmp_path / 'app.db'}", debug=False, token_revocation_sync=False)
+    engine = database.init_engine(settings)
+    SecurityEvent.__table__.create(bind=engine)
+    SecurityEventService.seen_keys.clear()
+    yield engine
+    SecurityEventService.seen_keys.clear()
+    database.dispose_engine()
+
+
+@pytest.fixture
+def client(engine):
+    settings = Settings(database_url=str(engine.url), debug=False, token_revocation_sync=False)
+    with TestClient(create_app(settings)) as client:
+        client.headers["Authorization"] = f"Bearer {create_access_token({'sub': 'sensor', 'role': 'user'})}"
+        yield client
+
+
+def event(key=None, event_type="port_scan"):
+    return {"event_type": event_type, "source_ip": "192.0.2.1", "description": "scan", "idempotency_key": key}
+
+
+def stored(engine):
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(SecurityEvent)).scalar_one()
+
+
+def test_retried_event_is_stored_once(client, engine):
+    first = client.post("/api/v1/security/events", json=event("sensor-1:42"))
+    retry = client.post("/api/v1/security/events", json=event("sensor-1:42"))
+
+    assert first.status_code == 201
+    assert retry.status_code == 200
+    assert retry.json()["data"] == {"accepted": 0, "duplicates": 1}
+    assert stored(engine) == 1
+
+
+def test_batch_skips_duplicates_in_one_insert(client, engine):
+    client.post("/api/v1/security/events", json=event("a"))
+    batch = [event("a"), event("b"), event("b"), event(), event()]
+
+    response = client.post("/api/v1/security/events/batch", json={"events": batch})
+
+    assert response.status_code == 201
+    assert response.json()["data"] == {"accepted": 3, "duplicates": 2}  # Events without a key are never deduplicated
+    assert stored(engine) == 4
+
+
+def test_unique_index_catches_keys_the_seen_set_forgot(client, engine):
+    client.post("/api/v1/security/events/batch", json={"events": [event("a"), event("b")]})
+    SecurityEventService.seen_keys.clear()  # Window expired, or another worker wrote them
+
+    response = client.post("/api/v1/security/events/batch", json={"events": [event("a"), event("b"), event("c")]})
+
+    assert response.json()["data"] == {"accepted": 1, "duplicates": 2}
+    assert stored(engine) == 3
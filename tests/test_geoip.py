@@ -0,0 +1,101 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.core.config import Settings
+from app.core.security import create_access_token
+from app.db import database
+from app.main import create_app
+from app.models.security_event import SecurityEvent
+from app.services.geoip_service import GeoInfo, GeoIPEnricher, IPRangeDatabase, build_ip_database, geoip
+
+RANGES = [
+    ("1.0.0.0", "1.0.0.255", "AU", 13335, "Cloudflare"),
+    ("8.8.8.0", "8.8.8.255", "US", 15169, "Google"),
+    ("2001:4860::", "2001:4860:ffff:ffff:ffff:ffff:ffff:ffff", "US", 15169, "Google"),
+    ("10.0.0.0", "10.255.255.255", None, None, None),
+]
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    path = str(tmp_path / "geo.ipdb")
+    build_ip_database(RANGES, path)
+    return path
+
+
+def test_lookup_ipv4_ipv6_and_misses(database_path):
+    db = IPRangeDatabase(database_path)
+
+    assert db.lookup("8.8.8.8") == GeoInfo("US", 15169, "Google")
+    assert db.lookup("1.0.0.0") == GeoInfo("AU", 13335, "Cloudflare")
+    assert db.lookup("2001:4860::8888") == GeoInfo("US", 15169, "Google")
+    assert db.lookup("::ffff:8.8.8.8") == GeoInfo("US", 15169, "Google")
+    assert db.lookup("10.1.2.3") == GeoInfo(None, None, None)
+    assert db.lookup("8.8.9.1") is None
+    assert db.lookup("not-an-ip") is None
+    db.close()
+
+
+def test_overlapping_ranges_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        build_ip_database([("1.0.0.0", "1.0.0.10", "AU", 1, None), ("1.0.0.5", "1.0.0.20", "AU", 1, None)],
+                          str(tmp_path / "bad.ipdb"))
+
+
+def test_enricher_caches_hot_ips(database_path):
+    enricher = GeoIPEnricher(cache_size=10)
+    enricher.load(database_path)
+
+    for _ in range(3):
+        enricher.lookup("8.8.8.8")
+
+    assert enricher.cache_stats()["hits"] == 2
+
+
+def test_reload_swaps_database_atomically(database_path):
+    enricher = GeoIPEnricher()
+    old = enricher.load(database_path)
+    assert enricher.lookup("8.8.8.8").country_code == "US"
+    assert enricher.reload_if_changed(database_path) is False
+
+    build_ip_database([("8.8.8.0", "8.8.8.255", "DE", 3320, "Telekom")], database_path)
+
+    assert enricher.reload_if_changed(database_path) is True
+    assert enricher.lookup("8.8.8.8").country_code == "DE"  # Cache belongs to the new file
+    assert old.lookup("8.8.8.8").country_code == "US"  # In-flight readers keep the old mapping
+
+
+def test_ingested_events_are_enriched(tmp_path, database_path):
+    database.dispose_engine()
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'app.db'}",
+        geoip_database_path=database_path,
+        debug=False,
+        token_revocation_sync=False,
+    )
+    engine = database.init_engine(settings)
+    SecurityEvent.__table__.create(bind=engine)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'sensor', 'role': 'user'})}"}
+    events = [
+        {"event_type": "port_scan", "source_ip": "8.8.8.8", "description": "scan"},
+        {"event_type": "port_scan", "source_ip": "192.0.2.1", "severity": "high", "description": "scan"},
+    ]
+
+    try:
+        with TestClient(create_app(settings)) as client:
+            response = client.post("/api/v1/security/events/batch", json={"events": events}, headers=headers)
+        with engine.connect() as connection:
+            rows = connection.execute(
+                select(SecurityEvent.source_ip, SecurityEvent.country_code, SecurityEvent.asn, SecurityEvent.asn_org)
+                .order_by(SecurityEvent.id)
+            ).all()
+    finally:
+        geoip.unload()
+        database.dispose_engine()
+
+    assert response.status_code == 201
+    assert response.json()["data"] == {"accepted": 2, "duplicates": 0}
+    assert [tuple(row) for row in rows] == [
+        ("8.8.8.8", "US", 15169, "Google"),
+        ("192.0.2.1", None, None, None),
+    ]
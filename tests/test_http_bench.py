@@ -0,0 +1,56 @@
+import importlib.util
+import os
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "http_bench", os.path.join(os.path.dirname(__file__), "..", "benchmarks", "http_bench.py")
+)
+http_bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(http_bench)
+
+BASELINE = {"endpoints": {"health": {"p50_ms": 10.0, "p99_ms": 20.0, "throughput_rps": 1000.0}}}
+
+
+@pytest.mark.parametrize("count, fraction, expected", [
+    (100, 0.50, 50),
+    (100, 0.99, 99),
+    (150, 0.99, 149),
+    (5, 0.50, 3),
+    (10, 0.99, 10),
+    (1, 0.99, 1),
+    (3, 0.0, 1),
+])
+def test_percentile_is_nearest_rank(count, fraction, expected):
+    assert http_bench.percentile([float(value) for value in range(1, count + 1)], fraction) == expected
+
+
+def test_percentile_of_no_samples():
+    assert http_bench.percentile([], 0.99) == 0.0
+
+
+def result(p50=10.0, p99=20.0, throughput=1000.0):
+    return {"health": {"p50_ms": p50, "p99_ms": p99, "throughput_rps": throughput}}
+
+
+def test_latency_threshold():
+    assert http_bench.compare_with_baseline(result(p50=12.5, p99=25.0), BASELINE, 0.25) == []
+    regressions = http_bench.compare_with_baseline(result(p50=12.6, p99=25.1), BASELINE, 0.25)
+
+    assert [regression.split(" ")[1] for regression in regressions] == ["p50_ms", "p99_ms"]
+
+
+def test_throughput_threshold():
+    assert http_bench.compare_with_baseline(result(throughput=750.0), BASELINE, 0.25) == []
+    assert http_bench.compare_with_baseline(result(throughput=5000.0), BASELINE, 0.25) == []  # Faster is fine
+    regressions = http_bench.compare_with_baseline(result(throughput=749.0), BASELINE, 0.25)
+
+    assert regressions == ["health: throughput_rps 749.0 < baseline 1000.0"]
+
+
+def test_endpoints_missing_from_baseline_are_skipped():
+    results = {**result(p50=100.0), "login": {"p50_ms": 500.0, "p99_ms": 900.0, "throughput_rps": 1.0}}
+
+    regressions = http_bench.compare_with_baseline(results, BASELINE, 0.25)
+
+    assert len(regressions) == 1 and regressions[0].startswith("health: p50_ms")
+    assert http_bench.compare_with_baseline(results, {}, 0.25) == []
@@ -0,0 +1,91 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.config import Settings, settings
+from app.core.metrics import LatencyHistogram, MetricsRegistry, is_scrape_allowed
+from app.middleware.metrics import UNMATCHED_ROUTE, MetricsMiddleware
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = LatencyHistogram((0.1, 0.5, 1.0))
+    for value in (0.05, 0.1, 0.3, 0.7, 5.0):
+        histogram.observe(value)
+
+    # le is inclusive: 0.1 falls in the 0.1 bucket
+    assert histogram.cumulative() == [2, 3, 4, 5]
+    assert histogram.count == 5
+    assert abs(histogram.total - 6.15) < 1e-9
+
+
+def test_render_emits_cumulative_buckets_and_escapes_labels():
+    registry = MetricsRegistry(buckets=[0.1, 1.0])
+    registry.observe_request("GET", '/odd"route\\', 200, 0.05)
+    registry.observe_request("GET", '/odd"route\\', 200, 0.5)
+
+    output = registry.render()
+    labels = 'method="GET",route="/odd\\"route\\\\",status="200"'
+    assert f"http_requests_total{{{labels}}} 2" in output
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in output
+    assert f'http_request_duration_seconds_bucket{{{labels},le="1.0"}} 2' in output
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in output
+    assert f"http_request_duration_seconds_count{{{labels}}} 2" in output
+
+
+def test_render_skips_broken_gauge():
+    registry = MetricsRegistry(buckets=[1.0])
+    registry.register_gauge("good_gauge", "Works", lambda: 3)
+    registry.register_gauge("broken_gauge", "Raises", lambda: 1 / 0)
+
+    output = registry.render()
+    assert "good_gauge 3.0" in output
+    assert "broken_gauge" not in output
+
+
+def test_middleware_labels_by_route_template():
+    registry = MetricsRegistry(buckets=[1.0])
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+
+    assert registry.requests[("GET", "/items/{item_id}", 200)].count == 2
+    assert registry.requests[("GET", UNMATCHED_ROUTE, 404)].count == 1
+
+
+def test_scrape_allowed_by_ip_or_token(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_allowed_ips", ["127.0.0.1"])
+    monkeypatch.setattr(settings, "metrics_token", "scrape-token")
+
+    assert is_scrape_allowed("127.0.0.1", None)
+    assert is_scrape_allowed("203.0.113.9", "Bearer scrape-token")
+    assert not is_scrape_allowed("203.0.113.9", "Bearer wrong")
+    assert not is_scrape_allowed("203.0.113.9", None)
+
+    monkeypatch.setattr(settings, "metrics_token", None)
+    assert not is_scrape_allowed("203.0.113.9", "Bearer ")
+
+
+def test_loopback_is_not_trusted_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_allowed_ips", Settings.model_fields["metrics_allowed_ips"].default)
+    monkeypatch.setattr(settings, "metrics_token", None)
+
+    assert not is_scrape_allowed("127.0.0.1", None)  # A same-host reverse proxy forwards from loopback
+
+
+def test_metrics_endpoint_rejects_unlisted_clients(monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "metrics_allowed_ips", ["127.0.0.1"])
+    monkeypatch.setattr(settings, "metrics_token", "scrape-token")
+    client = TestClient(app)  # Peer address is "testclient"
+
+    assert client.get("/metrics").status_code == 403
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
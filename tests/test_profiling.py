@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.profiling import _prune_profiles, run_in_threadpool, sign_profile_request, verify_profile_signature
+from app.core.security import create_access_token
+from app.middleware.profiling import ProfilingMiddleware
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def client(profile_dir):
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, sample_rate=0)
+    return TestClient(app)
+
+
+def test_signature_round_trip():
+    assert verify_profile_signature(sign_profile_request("/slow"), "/slow")
+
+
+def test_signature_rejects_wrong_path_expired_and_tampered():
+    signature = sign_profile_request("/slow")
+    expires, _, digest = signature.partition(".")
+
+    assert not verify_profile_signature(signature, "/other")
+    assert not verify_profile_signature(sign_profile_request("/slow", ttl_seconds=-10), "/slow")
+    assert not verify_profile_signature(f"{int(expires) + 3600}.{digest}", "/slow")
+    assert not verify_profile_signature(f"{expires}.{'0' * len(digest)}", "/slow")
+    assert not verify_profile_signature("garbage", "/slow")
+
+
+def test_prune_keeps_newest_within_bounds(profile_dir, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_max_files", 3)
+    monkeypatch.setattr(settings, "profiling_max_bytes", 25)
+    now = time.time()
+    for index in range(5):
+        path = profile_dir / f"{index}.collapsed"
+        path.write_text("x" * 10)
+        os.utime(path, (now + index, now + index))
+    (profile_dir / "unrelated.txt").write_text("keep me")
+
+    _prune_profiles(str(profile_dir))
+
+    # 3 files allowed by count, but 30 bytes > 25 so only the newest 2 survive
+    assert sorted(os.listdir(profile_dir)) == ["3.collapsed", "4.collapsed", "unrelated.txt"]
+
+
+def test_signed_request_writes_profile(client, profile_dir):
+    response = client.get("/slow", headers={"X-Profile-Signature": sign_profile_request("/slow")})
+
+    profile_id = response.headers["x-profile-id"]
+    assert os.listdir(profile_dir) == [f"{profile_id}.collapsed"]
+
+
+def test_invalid_or_unauthenticated_requests_are_not_profiled(client, profile_dir):
+    user_token = create_access_token(data={"sub": "user1", "role": "user"})
+
+    responses = [
+        client.get("/slow", headers={"X-Profile-Signature": sign_profile_request("/other")}),
+        client.get("/slow?profile=1"),
+        client.get("/slow?profile=1", headers={"Authorization": f"Bearer {user_token}"}),
+    ]
+
+    assert all("x-profile-id" not in response.headers for response in responses)
+    assert os.listdir(profile_dir) == []
+
+
+def test_admin_flag_profiles_request(client, profile_dir):
+    admin_token = create_access_token(data={"sub": "admin", "role": "admin"})
+
+    response = client.get("/slow?profile=1", headers={"Authorization": f"Bearer {admin_token}"})
+
+    assert "x-profile-id" in response.headers
+    assert len(os.listdir(profile_dir)) == 1
+
+
+def test_sampled_requests_do_not_reveal_profile_id(profile_dir):
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, sample_rate=1)
+    response = TestClient(app).get("/slow")
+
+    assert "x-profile-id" not in response.headers
+    assert len(os.listdir(profile_dir)) == 1
+
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_threadpool_and_awaited_time_is_profiled(profile_dir):
+    app = FastAPI()
+
+    @app.get("/blocking")
+    async def blocking():
+        await run_in_threadpool(spin, 0.3)
+        return {"ok": True}
+
+    @app.get("/waiting")
+    async def waiting():
+        await asyncio.sleep(0.3)
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, sample_rate=0)
+    client = TestClient(app)
+    profiles = {}
+    for path in ("/blocking", "/waiting"):
+        response = client.get(path, headers={"X-Profile-Signature": sign_profile_request(path)})
+        profiles[path] = (profile_dir / f"{response.headers['x-profile-id']}.collapsed").read_text()
+
+    assert "blocking (" in profiles["/blocking"] and "spin (" in profiles["/blocking"]
+    assert "waiting (" in profiles["/waiting"] and "[off-cpu]" in profiles["/waiting"]
@@ -0,0 +1,100 @@
+import sqlite3
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import column, table, text
+from sqlalchemy.orm import Session
+from app.core.config import Settings
+from app.db import database
+from app.db.replicas import RecentWriters
+
+
+def _make_db(path, value):
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE marker (value TEXT)")
+    connection.execute("INSERT INTO marker VALUES (?)", (value,))
+    connection.commit()
+    connection.close()
+    return f"sqlite:///{path}"
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    def factory(replica_names=("replica",), read_your_writes_seconds=0.0):
+        primary_url = _make_db(tmp_path / "primary.db", "primary")
+        replica_urls = [_make_db(tmp_path / f"{name}.db", name) for name in replica_names]
+        database.dispose_engine()
+        database.init_engine(Settings(
+            database_url=primary_url,
+            database_replica_urls=replica_urls,
+            database_read_your_writes_seconds=read_your_writes_seconds,
+            debug=False,
+        ))
+
+        app = FastAPI()
+
+        @app.get("/read")
+        def read(db: Session = Depends(database.get_read_db)):
+            return db.execute(text("SELECT value FROM marker")).scalars().all()
+
+        @app.post("/write")
+        def write(db: Session = Depends(database.get_db)):
+            db.execute(table("marker", column("value")).insert().values(value="written"))
+            db.commit()
+            return "ok"
+
+        return TestClient(app)
+
+    yield factory
+    database.dispose_engine()
+
+
+def test_reads_go_to_replica_and_writes_to_primary(make_client):
+    client = make_client()
+
+    assert client.get("/read").json() == ["replica"]
+    client.post("/write")
+    assert client.get("/read").json() == ["replica"]  # Window disabled, replica is stale
+
+
+def test_round_robin_across_replicas(make_client):
+    client = make_client(replica_names=("replica_a", "replica_b"))
+
+    results = [client.get("/read").json()[0] for _ in range(4)]
+
+    assert results == ["replica_a", "replica_b", "replica_a", "replica_b"]
+
+
+def test_unhealthy_replica_falls_back_to_primary(make_client, tmp_path):
+    client = make_client()
+    (tmp_path / "replica.db").unlink()
+    database.replica_set.engines[0].dispose()
+    database.replica_set.engines[0] = database._create_engine(
+        f"sqlite:///{tmp_path / 'missing' / 'replica.db'}", Settings(debug=False)
+    )
+
+    database.replica_set.check_health()
+
+    assert database.replica_set.healthy == [False]
+    assert client.get("/read").json() == ["primary"]
+
+
+def test_read_your_writes_window(make_client):
+    client = make_client(read_your_writes_seconds=30)
+
+    client.post("/write", headers={"Authorization": "Bearer writer"})
+
+    assert client.get("/read", headers={"Authorization": "Bearer writer"}).json() == ["primary", "written"]
+    assert client.get("/read", headers={"Authorization": "Bearer other"}).json() == ["replica"]
+    assert all("writer" not in key for key in database.recent_writers._until)  # Tokens are stored hashed
+
+
+def test_recent_writers_evicts_oldest_at_max_entries():
+    writers = RecentWriters(window_seconds=60, max_entries=3)
+
+    for key in ("a", "b", "c", "a", "d"):
+        writers.mark(key)
+
+    assert len(writers) == 3
+    assert not writers.is_recent("b")
+    assert all(writers.is_recent(key) for key in ("a", "c", "d"))
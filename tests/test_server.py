@@ -0,0 +1,168 @@
+import itertools
+import pytest
+from app.core import server
+from app.core.config import settings
+from app.core.server import WorkerSupervisor, _Worker
+
+_pids = itertools.count(1000)
+
+
+class StubProcess:
+    """Stands in for multiprocessing.Process"""
+
+    def __init__(self, alive: bool = True, exitcode: int = None):
+        self.pid = next(_pids)
+        self.alive = alive
+        self.exitcode = exitcode
+        self.terminated = False
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def join(self, timeout: float = None) -> None:
+        pass
+
+    def terminate(self) -> None:
+        self.terminated = True
+        self.alive = False
+        self.exitcode = 0
+
+    kill = terminate
+
+
+class StubReady:
+    """Stands in for the worker's multiprocessing.Event"""
+
+    def __init__(self, ready: bool):
+        self.ready = ready
+
+    def is_set(self) -> bool:
+        return self.ready
+
+    def wait(self, timeout: float = None) -> bool:
+        return self.ready
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(server.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def supervisor(monkeypatch, clock):
+    monkeypatch.setattr(settings, "server_worker_min_uptime", 5.0)
+    monkeypatch.setattr(settings, "server_worker_max_failures", 3)
+    monkeypatch.setattr(settings, "server_graceful_timeout", 1)
+    supervisor = WorkerSupervisor(workers=1)
+    supervisor.spawned = []
+    supervisor.next_ready = True
+
+    def spawn():
+        worker = _Worker(StubProcess(), StubReady(supervisor.next_ready), clock[0])
+        supervisor.spawned.append(worker)
+        return worker
+
+    monkeypatch.setattr(supervisor, "_spawn", spawn)
+    supervisor.workers = [spawn()]
+    supervisor.failures = [0]
+    supervisor.respawn_at = [0.0]
+    return supervisor
+
+
+def exit_worker(supervisor, exitcode: int, ready: bool = True) -> None:
+    worker = supervisor.workers[0]
+    worker.process.alive, worker.process.exitcode = False, exitcode
+    worker.ready.ready = ready
+
+
+def test_recycled_worker_is_replaced_immediately(supervisor, clock):
+    supervisor.failures[0] = 2
+    clock[0] += 600
+    exit_worker(supervisor, exitcode=0)
+
+    supervisor._replace_exited_workers()
+
+    assert len(supervisor.spawned) == 2
+    assert supervisor.workers[0] is supervisor.spawned[1]
+    assert supervisor.failures == [0]
+
+
+def test_crash_after_healthy_run_is_not_counted_as_failure(supervisor, clock):
+    clock[0] += 600
+    exit_worker(supervisor, exitcode=1)
+
+    supervisor._replace_exited_workers()
+
+    assert len(supervisor.spawned) == 2
+    assert supervisor.failures == [0]
+
+
+def test_early_crashes_back_off_then_give_up(supervisor, clock):
+    exit_worker(supervisor, exitcode=1, ready=False)
+    supervisor._replace_exited_workers()
+
+    assert supervisor.failures == [1]
+    assert supervisor.workers == [None]
+    assert supervisor.respawn_at == [clock[0] + 1.0]
+
+    supervisor._replace_exited_workers()
+    assert len(supervisor.spawned) == 1  # Still backing off
+
+    clock[0] += 1.0
+    supervisor._replace_exited_workers()
+    assert len(supervisor.spawned) == 2
+
+    exit_worker(supervisor, exitcode=1)  # Ready, but died within min uptime
+    supervisor._replace_exited_workers()
+    assert supervisor.failures == [2]
+    assert supervisor.respawn_at == [clock[0] + 2.0]
+
+    clock[0] += 2.0
+    supervisor._replace_exited_workers()
+    exit_worker(supervisor, exitcode=1, ready=False)
+    supervisor._replace_exited_workers()
+
+    assert supervisor.failures == [3]
+    assert supervisor.exit_code == 1
+    assert supervisor.should_exit
+    assert supervisor.workers == [None]
+
+
+def test_max_requests_jitter_bounds(monkeypatch, supervisor):
+    monkeypatch.setattr(settings, "server_max_requests", 0)
+    assert supervisor._max_requests() is None
+
+    monkeypatch.setattr(settings, "server_max_requests", 1000)
+    monkeypatch.setattr(settings, "server_max_requests_jitter", 50)
+    values = {supervisor._max_requests() for _ in range(2000)}
+
+    assert min(values) == 1000 and max(values) == 1050
+
+    monkeypatch.setattr(settings, "server_max_requests_jitter", 0)
+    assert supervisor._max_requests() == 1000
+
+
+def test_rolling_restart_keeps_worker_when_successor_never_ready(supervisor):
+    old_worker = supervisor.workers[0]
+    supervisor.next_ready = False
+
+    supervisor._rolling_restart()
+
+    new_worker = supervisor.spawned[1]
+    assert supervisor.workers == [old_worker]
+    assert not old_worker.process.terminated
+    assert new_worker.process.terminated
+
+
+def test_rolling_restart_replaces_worker_once_successor_is_ready(supervisor):
+    old_worker = supervisor.workers[0]
+    supervisor.failures[0] = 2
+
+    supervisor._rolling_restart()
+
+    assert supervisor.workers == [supervisor.spawned[1]]
+    assert old_worker.process.terminated
+    assert not supervisor.spawned[1].process.terminated
+    assert supervisor.failures == [0]
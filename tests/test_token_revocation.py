@@ -0,0 +1,121 @@
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.core import revocation
+from app.core.config import Settings
+from app.core.revocation import RedisRevocationSync, RevocationList
+from app.core.security import create_access_token, verify_token
+from app.main import create_app
+
+
+@pytest.fixture(autouse=True)
+def clear_revocations():
+    revocation.revocation_list.clear()
+    yield
+    revocation.revocation_list.clear()
+
+
+def test_revoked_token_fails_verification():
+    token = create_access_token({"sub": "alice"})
+    other = create_access_token({"sub": "alice"})
+    payload = verify_token(token)
+
+    revocation.revocation_list.revoke_token(payload["jti"], payload["exp"])
+
+    assert verify_token(token) is None
+    assert verify_token(other) is not None
+
+
+def test_revoke_user_covers_tokens_issued_before_cutoff():
+    old = create_access_token({"sub": "alice"})
+    bob = create_access_token({"sub": "bob"})
+    revocation.revocation_list.revoke_user("alice", time.time(), time.time() + 60)
+    new = create_access_token({"sub": "alice"})
+
+    assert verify_token(old) is None
+    assert verify_token(bob) is not None
+    assert verify_token(new) is not None
+
+
+def test_time_wheel_drops_expired_entries():
+    revocations = RevocationList()
+    now = time.time()
+    revocations.revoke_token("short", now + 5)
+    revocations.revoke_token("long", now + 500)
+    revocations.revoke_user("alice", now, now + 5)
+    revocations.revoke_user("bob", now, now + 5)
+    revocations.revoke_user("bob", now, now + 500)  # Extends bob's entry
+
+    revocations.expire(now + 10)
+
+    assert len(revocations) == 2
+    assert revocations.is_revoked({"jti": "long"})
+    assert not revocations.is_revoked({"jti": "short"})
+    assert revocations.is_revoked({"sub": "bob", "iat": now - 1})
+    assert not revocations.is_revoked({"sub": "alice", "iat": now - 1})
+
+
+def test_already_expired_token_is_not_stored():
+    revocations = RevocationList()
+
+    assert revocations.revoke_token("gone", time.time() - 1) is False
+    assert len(revocations) == 0
+
+
+def test_apply_replays_events_from_other_workers():
+    revocations = RevocationList()
+    now = time.time()
+
+    revocations.apply({"type": "token", "jti": "abc", "exp": now + 60})
+    revocations.apply({"type": "user", "sub": "alice", "cutoff": now, "until": now + 60})
+
+    assert revocations.is_revoked({"jti": "abc"})
+    assert revocations.is_revoked({"sub": "alice", "iat": now - 1})
+
+
+def test_unsynced_revocations_are_queued_without_blocking():
+    sync = RedisRevocationSync(RevocationList(), "redis://127.0.0.1:1/0", "test_revocations", timeout=0.5)
+    offline = {"type": "token", "jti": "offline", "exp": time.time() + 60}
+    failed = {"type": "token", "jti": "failed", "exp": time.time() + 60}
+
+    async def publish():
+        sync.publish(offline)  # Not connected yet: queued for run()
+        sync.connected = True
+        start = time.perf_counter()
+        sync.publish(failed)  # Connected, but Redis is unreachable: fails in the background
+        elapsed = time.perf_counter() - start
+        await sync.close()
+        return elapsed
+
+    assert asyncio.run(publish()) < 0.05
+    assert sync._pending == [offline, failed]
+
+
+@pytest.fixture
+def client():
+    app = create_app(Settings(debug=False, metrics_enabled=False, token_revocation_sync=False))
+    with TestClient(app) as client:
+        yield client
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_logout_revokes_token(client):
+    token = create_access_token({"sub": "alice", "role": "user"})
+
+    assert client.post("/api/v1/auth/logout", headers=_auth(token)).status_code == 200
+    assert client.get("/api/v1/auth/me", headers=_auth(token)).status_code == 401
+
+
+def test_revoke_all_requires_admin_for_other_users(client):
+    alice = create_access_token({"sub": "alice", "role": "user"})
+    bob = create_access_token({"sub": "bob", "role": "user"})
+    admin = create_access_token({"sub": "admin", "role": "admin"})
+
+    assert client.post("/api/v1/auth/revoke-all?username=bob", headers=_auth(alice)).status_code == 403
+    assert client.post("/api/v1/auth/revoke-all?username=bob", headers=_auth(admin)).status_code == 200
+    assert client.get("/api/v1/auth/me", headers=_auth(bob)).status_code == 401
+    assert client.get("/api/v1/auth/me", headers=_auth(alice)).status_code == 200
@@ -0,0 +1,219 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from app.core.config import Settings, settings
+from app.core.security import create_access_token, verify_password
+from app.db import database
+from app.db.database import Base
+from app.main import create_app
+from app.models.user import User
+from app.services import auth_service, user_import_service
+from app.services.user_import_service import UserImportJobRunner, UserImportService, summarize
+
+CSV = """username,email,password,full_name,role
+alice,alice@example.com,secret1,Alice,user
+bob,bob@example.com,secret2,,analyst
+alice,alice2@example.com,secret3,,user
+carol,not-an-email,secret4,,user
+dave,dave@example.com,secret5,,root
+erin,existing@example.com,secret6,,user
+"""
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "user_import_dir", str(tmp_path / "imports"))
+    database.dispose_engine()
+    engine = database.init_engine(Settings(database_url=f"sqlite:///{tmp_path / 'app.db'}", debug=False))
+    Base.metadata.create_all(bind=engine, tables=[User.__table__])
+    auth_service.user_cache.clear()
+    auth_service.unknown_user_cache.clear()
+
+    session = database.SessionLocal()
+    session.add(User(username="existing", email="existing@example.com", hashed_password="x"))
+    session.commit()
+    yield session
+    session.close()
+    database.dispose_engine()
+
+
+def test_parse_csv_strips_values():
+    rows = UserImportService.parse_csv(" username , email \n bob , bob@example.com \n")
+
+    assert rows == [{"username": "bob", "email": "bob@example.com"}]
+
+
+def test_import_reports_each_row(db, monkeypatch):
+    monkeypatch.setattr(user_import_service, "get_password_hash", lambda password: f"hashed-{password}")
+
+    results = UserImportService.import_users(db, UserImportService.parse_csv(CSV))
+
+    assert [(result["row"], result["status"]) for result in results] == [
+        (1, "created"), (2, "created"), (3, "duplicate"), (4, "invalid"), (5, "invalid"), (6, "duplicate"),
+    ]
+    assert results[3]["error"].startswith("email:")
+    assert summarize(results) == {"created": 2, "duplicate": 2, "invalid": 2}
+    assert db.execute(select(User.role).where(User.username == "bob")).scalar() == "analyst"
+
+
+def test_duplicate_check_is_one_query_per_batch(db, monkeypatch):
+    monkeypatch.setattr(user_import_service, "get_password_hash", lambda password: "hashed")
+    monkeypatch.setattr(settings, "user_import_batch_size", 10)
+    rows = [{"username": f"user{i}", "email": f"user{i}@example.com", "password": "pw"} for i in range(30)]
+    selects = []
+
+    @event.listens_for(database.get_engine(), "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    results = UserImportService.import_users(db, rows)
+
+    assert summarize(results)["created"] == 30
+    assert len(selects) == 3
+
+
+@pytest.mark.parametrize("on_conflict", [True, False])
+def test_concurrent_insert_does_not_lose_the_batch(db, monkeypatch, on_conflict):
+    def hash_while_bob_signs_up(passwords):
+        if "bob" not in signed_up:
+            signed_up.append("bob")
+            other = database.SessionLocal()
+            other.add(User(username="bob", email="bob@example.com", hashed_password="x"))
+            other.commit()
+            other.close()
+        return ["hashed"] * len(passwords)
+
+    signed_up = []
+
+    monkeypatch.setattr(user_import_service, "hash_passwords", hash_while_bob_signs_up)
+    if not on_conflict:
+        monkeypatch.setattr(user_import_service, "conflict_insert", lambda db, model: None)
+    rows = [{"username": name, "email": f"{name}@example.com", "password": "pw"} for name in ("amy", "bob", "cat")]
+
+    results = UserImportService.import_users(db, rows)
+
+    assert [(result["username"], result["status"]) for result in results] == [
+        ("amy", "created"), ("bob", "duplicate"), ("cat", "created"),
+    ]
+    assert db.execute(select(User.hashed_password).where(User.username == "bob")).scalar() == "x"
+
+
+def test_passwords_are_hashed_in_worker_processes(monkeypatch):
+    monkeypatch.setattr(settings, "user_import_workers", 2)
+    try:
+        hashes = user_import_service.hash_passwords(["first", "second", "third"])
+    finally:
+        user_import_service.shutdown_hash_pool()
+
+    assert [verify_password(password, hashed) for password, hashed in zip(["first", "second", "third"], hashes)] == [
+        True, True, True,
+    ]
+
+
+def test_import_clears_negative_cache(db, monkeypatch):
+    monkeypatch.setattr(user_import_service, "get_password_hash", lambda password: "hashed")
+    assert auth_service.AuthService.get_user_by_username(db, "frank") is None
+
+    UserImportService.import_users(db, [{"username": "frank", "email": "frank@example.com", "password": "pw"}])
+
+    assert auth_service.AuthService.get_user_by_username(db, "frank").email == "frank@example.com"
+
+
+@pytest.fixture
+def runner():
+    runner = UserImportJobRunner()
+    yield runner
+    runner.shutdown()
+
+
+def _wait_for_jobs(runner):
+    runner._executor.submit(lambda: None).result()  # Jobs run one at a time, in order
+
+
+def test_job_runs_to_completion(db, runner, monkeypatch, tmp_path):
+    monkeypatch.setattr(user_import_service, "get_password_hash", lambda password: "hashed")
+
+    job = runner.submit(UserImportService.parse_csv(CSV))
+    _wait_for_jobs(runner)
+
+    state = runner.get(job["id"])
+    assert state["status"] == "completed"
+    assert state["processed"] == 6
+    assert state["summary"] == {"created": 2, "duplicate": 2, "invalid": 2}
+    assert not (tmp_path / "imports" / f"{job['id']}.input.json").exists()
+
+
+def test_interrupted_job_resumes_from_saved_progress(db, runner, monkeypatch):
+    monkeypatch.setattr(user_import_service, "get_password_hash", lambda password: "hashed")
+    monkeypatch.setattr(settings, "user_import_batch_size", 2)
+    rows = [{"username": f"user{i}", "email": f"user{i}@example.com", "password": "pw"} for i in range(5)]
+    runner._queue = lambda job_id: None  # Store the job without running it
+    job = runner.submit(rows)
+
+    # Simulate a crash after the first batch was committed and recorded
+    UserImportService.import_users(db, rows[:2])
+    runner._save({**runner.get(job["id"]), "status": "running", "processed": 2})
+    del runner._queue
+
+    assert runner.resume_pending() == [job["id"]]
+    _wait_for_jobs(runner)
+
+    state = runner.get(job["id"])
+    assert state["status"] == "completed"
+    assert [result["row"] for result in state["results"]] == [3, 4, 5]
+    assert len(db.execute(select(User.id).where(User.username.like("user%"))).all()) == 5
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    monkeypatch.setattr(user_import_service, "get_password_hash", lambda password: "hashed")
+    app = create_app(Settings(debug=False, metrics_enabled=False))
+    with TestClient(app) as client:
+        yield client
+
+
+def _auth(role):
+    return {"Authorization": f"Bearer {create_access_token({'sub': 'admin', 'role': role})}"}
+
+
+def test_import_endpoint_requires_admin(client):
+    response = client.post("/api/v1/users/import", content=CSV, headers={
+        **_auth("user"), "Content-Type": "text/csv",
+    })
+
+    assert response.status_code == 403
+
+
+def test_import_endpoint_returns_row_results(client):
+    response = client.post("/api/v1/users/import?background=false", content=CSV, headers={
+        **_auth("admin"), "Content-Type": "text/csv",
+    })
+
+    body = response.json()["data"]
+    assert response.status_code == 200
+    assert body["summary"] == {"created": 2, "duplicate": 2, "invalid": 2}
+    assert len(body["results"]) == 6
+
+
+def test_import_job_endpoint(client):
+    users = [{"username": "gina", "email": "gina@example.com", "password": "pw"}]
+    response = client.post("/api/v1/users/import", content=json.dumps({"users": users}), headers={
+        **_auth("admin"), "Content-Type": "application/json",
+    })
+    assert response.status_code == 202
+    _wait_for_jobs(user_import_service.user_import_runner)
+
+    job = client.get(f"/api/v1/users/import/{response.json()['data']['id']}", headers=_auth("admin")).json()
+
+    assert job["data"]["status"] == "completed"
+    assert job["data"]["results"] == [{"row": 1, "username": "gina", "status": "created"}]
+
+
+def test_create_user_reports_conflict(client):
+    payload = {"username": "existing", "email": "other@example.com", "password": "pw"}
+
+    response = client.post("/api/v1/users/", json=payload, headers=_auth("admin"))
+
+    assert response.status_code == 409